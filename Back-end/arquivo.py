@@ -0,0 +1,151 @@
+import base64
+import gzip
+import json
+import os
+import struct
+from datetime import date
+from types import SimpleNamespace
+
+import orjson
+from dotenv import load_dotenv
+
+# ==================================
+#     ARQUIVO FRIO DAS DENÚNCIAS
+# ==================================
+# Meses que passaram do prazo de retenção saem do banco e vão para
+# arquivos compactados: um 'denuncias_AAAA_MM.jsonl.gz' por mês, uma
+# denúncia (com o anexo em base64) por linha. O 'indice.json' guarda a
+# faixa de ids de cada mês, para achar o arquivo certo sem abrir todos.
+#
+# Cada denúncia é um "membro" gzip separado (o arquivo continua sendo um
+# .gz válido) e o 'denuncias_AAAA_MM.pos' guarda, em ordem de id, onde
+# cada membro começa. Achar uma denúncia é uma busca binária no .pos e
+# UMA leitura no .gz: nunca descompactamos o mês inteiro.
+
+load_dotenv()
+
+ARQUIVO_DIR = os.getenv("ARQUIVO_DIR", "arquivo")
+INDICE = "indice.json"
+
+# Registro do arquivo de posições: id da denúncia, início e tamanho do membro gzip
+POSICAO = struct.Struct("<QQQ")
+
+
+def _caminho(nome: str) -> str:
+    return os.path.join(ARQUIVO_DIR, nome)
+
+
+def _nome_arquivo(mes: date) -> str:
+    return f"denuncias_{mes.year:04d}_{mes.month:02d}.jsonl.gz"
+
+
+def _nome_posicoes(mes: date) -> str:
+    return f"denuncias_{mes.year:04d}_{mes.month:02d}.pos"
+
+
+def ler_indice() -> dict:
+    """{'AAAA-MM': {'arquivo': ..., 'id_min': ..., 'id_max': ..., 'total': ...}}"""
+    try:
+        with open(_caminho(INDICE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _gravar_indice(indice: dict):
+    temporario = _caminho(INDICE + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(indice, f, indent=2, sort_keys=True)
+    os.replace(temporario, _caminho(INDICE))
+
+
+class GravadorMes:
+    """
+    Grava as denúncias de UM mês no arquivo frio, em ordem de id.
+    O arquivo só passa a valer (e entra no índice) no 'concluir()';
+    se algo falhar no meio, o banco continua com os dados.
+    """
+
+    def __init__(self, mes: date):
+        os.makedirs(ARQUIVO_DIR, exist_ok=True)
+        self.mes = mes
+        self.nome = _nome_arquivo(mes)
+        self.nome_posicoes = _nome_posicoes(mes)
+        self.arquivo = open(_caminho(self.nome + ".tmp"), "wb")
+        self.posicoes = open(_caminho(self.nome_posicoes + ".tmp"), "wb")
+        self.id_min = None
+        self.id_max = None
+        self.total = 0
+
+    def escrever(self, denuncia: dict):
+        registro = dict(denuncia)
+        registro["anexo"] = base64.b64encode(registro["anexo"]).decode("ascii")
+
+        id_denuncia = registro["id_denuncia"]
+        if self.id_max is not None and id_denuncia <= self.id_max:
+            raise ValueError("As denúncias precisam ser gravadas em ordem crescente de id")
+
+        membro = gzip.compress(orjson.dumps(registro) + b"\n", compresslevel=6, mtime=0)
+        self.posicoes.write(POSICAO.pack(id_denuncia, self.arquivo.tell(), len(membro)))
+        self.arquivo.write(membro)
+
+        self.id_min = id_denuncia if self.id_min is None else self.id_min
+        self.id_max = id_denuncia
+        self.total += 1
+
+    def concluir(self):
+        self.arquivo.close()
+        self.posicoes.close()
+        os.replace(_caminho(self.nome_posicoes + ".tmp"), _caminho(self.nome_posicoes))
+        os.replace(_caminho(self.nome + ".tmp"), _caminho(self.nome))
+
+        indice = ler_indice()
+        indice[f"{self.mes.year:04d}-{self.mes.month:02d}"] = {
+            "arquivo": self.nome,
+            "posicoes": self.nome_posicoes,
+            "id_min": self.id_min,
+            "id_max": self.id_max,
+            "total": self.total,
+        }
+        _gravar_indice(indice)
+
+
+def _posicao(caminho_posicoes: str, denuncia_id: int) -> tuple[int, int] | None:
+    """Busca binária no arquivo de posições: (início, tamanho) do membro gzip."""
+    with open(caminho_posicoes, "rb") as f:
+        inicio, fim = 0, os.fstat(f.fileno()).st_size // POSICAO.size
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            f.seek(meio * POSICAO.size)
+            id_lido, posicao, tamanho = POSICAO.unpack(f.read(POSICAO.size))
+            if id_lido == denuncia_id:
+                return posicao, tamanho
+            if id_lido < denuncia_id:
+                inicio = meio + 1
+            else:
+                fim = meio
+    return None
+
+
+def buscar_denuncia(denuncia_id: int) -> SimpleNamespace | None:
+    """
+    Procura uma denúncia arquivada pelo id (com o anexo já decodificado).
+    Lê só o registro dela. É leitura de disco bloqueante: nas rotas, rode
+    em uma thread.
+    """
+    for mes in ler_indice().values():
+        if not mes["id_min"] <= denuncia_id <= mes["id_max"]:
+            continue
+        # As faixas de ids de meses diferentes podem se cruzar (denúncias
+        # importadas ou com data retroativa): não estando aqui, segue
+        encontrada = _posicao(_caminho(mes["posicoes"]), denuncia_id)
+        if encontrada is None:
+            continue
+        posicao, tamanho = encontrada
+        with open(_caminho(mes["arquivo"]), "rb") as f:
+            f.seek(posicao)
+            registro = orjson.loads(gzip.decompress(f.read(tamanho)))
+        registro["anexo"] = base64.b64decode(registro["anexo"])
+        return SimpleNamespace(**registro)
+    return None
+
@@ -60,4 +60,19 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
         
-    return user
\ No newline at end of file
+    return user
+
+# Mesmo esquema, mas sem erro automático quando o token não vem
+oauth2_scheme_opcional = OAuth2PasswordBearer(tokenUrl="/api/login", auto_error=False)
+
+
+async def get_current_user_opcional(
+    token: Optional[str] = Depends(oauth2_scheme_opcional), db: AsyncSession = Depends(get_db)
+) -> Optional[models.Usuario]:
+    """
+    Dependência para rotas abertas que têm um trecho restrito:
+    retorna None sem token, e valida o token quando ele vem.
+    """
+    if token is None:
+        return None
+    return await get_current_user(token=token, db=db)
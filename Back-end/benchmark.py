@@ -0,0 +1,538 @@
+"""
+Benchmarks locais do De Olho no Pix (dentro da pasta Back-end):
+
+    python benchmark.py nomes --total 1000000 [--url mysql+asyncmy://root@localhost/bench_vazio]
+    python benchmark.py serializacao --linhas 10000
+    python benchmark.py particionamento   (usa o banco do .env)
+    python benchmark.py sugestoes --valores 3000000
+    python benchmark.py backends --mysql-url mysql+asyncmy://root@localhost/bench_vazio
+    python benchmark.py facetas --denuncias 200000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter, namedtuple
+
+import busca_nomes
+
+PRIMEIROS_NOMES = [
+    "João", "José", "Antônio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas",
+    "Luiz", "Marcos", "Luís", "Gabriel", "Rafael", "Daniel", "Marcelo", "Bruno",
+    "Eduardo", "Felipe", "Raimundo", "Rodrigo", "Thiago", "Wagner", "Jefferson",
+    "Maria", "Ana", "Francisca", "Antônia", "Adriana", "Juliana", "Márcia",
+    "Fernanda", "Patrícia", "Aline", "Sandra", "Camila", "Amanda", "Bruna",
+    "Jéssica", "Letícia", "Júlia", "Luciana", "Vanessa", "Mariana", "Gabriela",
+    "Conceição", "Elisângela", "Thaís", "Sueli", "Rosângela", "Cecília",
+]
+
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+    "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa", "Rocha",
+    "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado",
+    "Mendes", "Freitas", "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira",
+    "Araújo", "Conceição", "Magalhães", "Assunção", "Gusmão", "Brandão", "Cavalcanti",
+]
+
+PARTICULAS = ["da", "de", "dos", "do"]
+
+# Erros comuns de digitação de nomes (aplicados na consulta)
+TROCAS = [
+    ("ss", "ç"), ("ç", "ss"), ("s", "z"), ("z", "s"), ("i", "y"), ("th", "t"),
+    ("ff", "f"), ("f", "ph"), ("w", "v"), ("v", "w"), ("lh", "li"), ("u", "o"),
+]
+
+
+def gerar_nome(rnd: random.Random) -> str:
+    partes = [rnd.choice(PRIMEIROS_NOMES)]
+    if rnd.random() < 0.4:
+        partes.append(rnd.choice(PRIMEIROS_NOMES))
+    for _ in range(rnd.choice((1, 2, 2, 3))):
+        if rnd.random() < 0.3:
+            partes.append(rnd.choice(PARTICULAS))
+        partes.append(rnd.choice(SOBRENOMES))
+    return " ".join(partes)
+
+
+def estragar_nome(nome: str, rnd: random.Random) -> str:
+    """Simula como o denunciante digita o nome: sem acento, sem 'da', com erro."""
+    texto = busca_nomes.remover_acentos(nome)
+    palavras = [p for p in texto.split() if p.lower() not in PARTICULAS or rnd.random() < 0.5]
+    texto = " ".join(palavras)
+    for _ in range(rnd.choice((0, 1, 1, 2))):
+        origem, destino = rnd.choice(TROCAS)
+        if origem in texto.lower():
+            texto = texto.lower().replace(origem, destino, 1)
+    return texto
+
+
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def _bench_nomes(url: str, total: int, consultas: int, semente: int):
+    from sqlalchemy import insert, select, func
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    import crud
+    import models
+    from database import Base, criar_engine
+
+    engine = criar_engine(url)
+    Sessao = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rnd = random.Random(semente)
+    async with Sessao() as db:
+        if await db.scalar(select(func.count(models.Denuncia.id_denuncia))):
+            print("O banco já tem denúncias; use um banco vazio só para o benchmark.")
+            await engine.dispose()
+            return
+
+        # Carga em lote: as mesmas linhas (e chaves de nome) que a API grava.
+        # 30% das denúncias repetem uma conta já denunciada, de preferência
+        # das primeiras: sai de tudo, de grupos de 1 a grupos de milhares.
+        print(f"Gravando {total} denúncias...")
+        inicio = time.perf_counter()
+        contas, conta_da_denuncia = [], []
+        totais = Counter()
+        for primeiro in range(0, total, 10_000):
+            denuncias, chaves = [], []
+            for id_denuncia in range(primeiro + 1, min(primeiro + 10_000, total) + 1):
+                chave = f"{id_denuncia:011d}"
+                if contas and rnd.random() < 0.3:
+                    nome, cpf_cnpj = contas[int(len(contas) * rnd.random() ** 3)]
+                else:
+                    nome, cpf_cnpj = gerar_nome(rnd), chave
+                    contas.append((nome, cpf_cnpj))
+                conta_da_denuncia.append((nome, cpf_cnpj))
+                totais[cpf_cnpj] += 1
+                grupo = crud.grupo_fraude(nome, cpf_cnpj)
+                denuncias.append({
+                    "id_denuncia": id_denuncia, "grupo_fraude_id": grupo, "tipo_chave_pix": "CPF",
+                    "nome_conta": nome, "chave_pix": chave, "numero_bo": chave,
+                    "banco": "Banco", "cpf_cnpj": cpf_cnpj, "anexo": b"%PDF",
+                })
+                chaves.extend(
+                    {"id_denuncia": id_denuncia, "grupo_fraude_id": grupo, "chave": chave_nome}
+                    for chave_nome in busca_nomes.chaves_nome(nome)
+                )
+            await db.execute(insert(models.Denuncia), denuncias)
+            await db.execute(insert(models.DenunciaChaveNome), chaves)
+            await db.commit()
+        print(f"Gravadas em {time.perf_counter() - inicio:.0f}s")
+
+        async def medir(busca, alvos):
+            """
+            Acerto: o GRUPO procurado (a conta, pelo CPF/CNPJ, que é único
+            por conta aqui) está entre os 10 primeiros e com o total certo.
+            Não basta outro grupo com o mesmo nome.
+            """
+            acertos, total_errado, tempos = 0, 0, []
+            for nome, cpf_cnpj in alvos:
+                consulta = estragar_nome(nome, rnd)
+                t0 = time.perf_counter()
+                linhas = await busca(consulta)
+                tempos.append(time.perf_counter() - t0)
+                achada = next((l for l in linhas[:10] if l.cpf_cnpj == cpf_cnpj), None)
+                if achada is None:
+                    continue
+                if achada.total_denuncias == totais[cpf_cnpj]:
+                    acertos += 1
+                else:
+                    total_errado += 1
+            return acertos / len(alvos), total_errado, tempos
+
+        # Alvos sorteados por denúncia: os grupos grandes aparecem mais
+        alvos = [conta_da_denuncia[rnd.randrange(total)] for _ in range(consultas)]
+        recall_fuzzy, errados_fuzzy, tempos_fuzzy = await medir(
+            lambda consulta: crud.get_denuncias_by_nome_aproximado(db, nome=consulta, tipo=None), alvos
+        )
+        # O LIKE varre a tabela toda; amostra menor para não demorar demais
+        recall_like, errados_like, tempos_like = await medir(
+            lambda consulta: crud.get_denuncias_by_query(db, query=consulta, tipo=None),
+            alvos[: max(1, consultas // 20)]
+        )
+
+    await engine.dispose()
+
+    print(f"\n{len(contas)} contas; a maior com {max(totais.values())} denúncias")
+    print(f"Busca aproximada: recall@10 = {recall_fuzzy:.1%} ({errados_fuzzy} com total errado) "
+          f"| mediana {statistics.median(tempos_fuzzy) * 1000:.2f} ms "
+          f"| p99 {percentil(tempos_fuzzy, 0.99) * 1000:.2f} ms")
+    print(f"LIKE '%termo%':   recall@10 = {recall_like:.1%} ({errados_like} com total errado) "
+          f"| mediana {statistics.median(tempos_like) * 1000:.2f} ms "
+          f"| p99 {percentil(tempos_like, 0.99) * 1000:.2f} ms")
+
+
+def bench_nomes(url: str | None, total: int, consultas: int, semente: int):
+    """
+    Recall e latência da busca aproximada (crud.get_denuncias_by_nome_aproximado)
+    contra o LIKE '%termo%' (crud.get_denuncias_by_query), com 'total' nomes
+    sintéticos gravados em um banco: um SQLite temporário, ou o banco VAZIO de 'url'.
+    """
+    import os
+    import tempfile
+
+    if url:
+        asyncio.run(_bench_nomes(url, total, consultas, semente))
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        asyncio.run(_bench_nomes(f"sqlite+aiosqlite:///{caminho}", total, consultas, semente))
+
+
+def bench_serializacao(linhas: int, repeticoes: int):
+    """
+    Custo por linha da resposta da pesquisa: caminho antigo (um
+    schemas.DenunciaAgrupada por linha + validação do response_model +
+    json da biblioteca padrão) contra serializacao.py (dict + orjson).
+    """
+    from pydantic import TypeAdapter
+
+    import schemas
+    import serializacao
+
+    rnd = random.Random(42)
+    # Faz o papel das Rows do SQLAlchemy (tuplas com atributos)
+    Linha = namedtuple("Linha", serializacao.CAMPOS_DENUNCIA_AGRUPADA)
+    tuplas = [
+        Linha(
+            gerar_nome(rnd),
+            f"{rnd.randrange(10**11):011d}",
+            rnd.choice(("Nubank", "Banco do Brasil", "Caixa", "Itaú", "Bradesco", "Inter")),
+            f"{rnd.randrange(10**11):011d}\nfulano{rnd.randrange(1000)}@email.com",
+            rnd.randrange(1, 50),
+        )
+        for _ in range(linhas)
+    ]
+    adaptador = TypeAdapter(list[schemas.DenunciaAgrupada])
+
+    def caminho_antigo():
+        objetos = [
+            schemas.DenunciaAgrupada(
+                nome_conta=r.nome_conta,
+                cpf_cnpj=r.cpf_cnpj,
+                banco=r.banco,
+                chave_pix_exemplo=r.chave_pix_exemplo,
+                total_denuncias=r.total_denuncias
+            ) for r in tuplas
+        ]
+        # O que o FastAPI faz com o response_model: valida e converte de novo
+        validados = adaptador.validate_python(objetos, from_attributes=True)
+        return json.dumps(adaptador.dump_python(validados, mode="json"), ensure_ascii=False).encode("utf-8")
+
+    def caminho_rapido():
+        return serializacao.json_denuncias_agrupadas(tuplas).body
+
+    assert json.loads(caminho_antigo()) == json.loads(caminho_rapido())
+
+    for nome, funcao in (("Pydantic + json", caminho_antigo), ("orjson direto", caminho_rapido)):
+        tempos = []
+        for _ in range(repeticoes):
+            t0 = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - t0)
+        por_linha = statistics.median(tempos) / linhas * 1_000_000
+        print(f"{nome:<16} {statistics.median(tempos) * 1000:8.2f} ms por resposta | {por_linha:6.2f} µs por linha")
+
+
+async def _bench_particionamento(dias: int, repeticoes: int):
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import text
+
+    import crud
+    from database import AsyncSessionLocal, engine
+
+    desde = datetime.utcnow() - timedelta(days=dias)
+    cenarios = (
+        ("Tudo", None, None),
+        (f"Últimos {dias} dias", desde, None),
+        (f"Últimos {dias} dias + tipo", desde, "CPF"),
+    )
+
+    async with AsyncSessionLocal() as db:
+        if engine.dialect.name == "mysql":
+            plano = await db.execute(
+                text("EXPLAIN SELECT COUNT(*) FROM denuncias WHERE data_denuncia >= :desde"),
+                {"desde": desde},
+            )
+            linha = plano.mappings().first()
+            print(f"Partições lidas com 'desde': {linha.get('partitions') or '(tabela sem partições)'}\n")
+
+        for nome, data_minima, tipo in cenarios:
+            tempos = []
+            for _ in range(repeticoes):
+                t0 = time.perf_counter()
+                linhas = await crud.get_denuncias_by_query(db, query=None, tipo=tipo, desde=data_minima)
+                tempos.append(time.perf_counter() - t0)
+            print(f"{nome:<28} {len(linhas):>8} grupos | mediana {statistics.median(tempos) * 1000:8.2f} ms "
+                  f"| p99 {percentil(tempos, 0.99) * 1000:8.2f} ms")
+
+    await engine.dispose()
+
+
+def bench_particionamento(dias: int, repeticoes: int):
+    """
+    Latência da pesquisa no banco configurado, com e sem data mínima.
+    Rode antes e depois de 'python tarefas.py particionar' para comparar.
+    """
+    asyncio.run(_bench_particionamento(dias, repeticoes))
+
+
+async def _bench_backend(nome: str, url: str, denuncias: int, repeticoes: int):
+    import os
+
+    from sqlalchemy import select, func
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    import crud
+    import models
+    from database import Base, criar_engine
+
+    engine = criar_engine(url)
+    Sessao = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rnd = random.Random(42)
+    async with Sessao() as db:
+        if await db.scalar(select(func.count(models.Denuncia.id_denuncia))):
+            print(f"{nome}: o banco já tem denúncias; use um banco vazio só para o benchmark.")
+            await engine.dispose()
+            return
+
+        # Uma denúncia por commit, como chegam pela API
+        t0 = time.perf_counter()
+        for i in range(denuncias):
+            anexo = os.urandom(2048)
+            anexo_hash = crud.hash_anexo(anexo)
+            chave = f"{rnd.randrange(10**11):011d}"
+            await crud.create_denuncia(
+                db=db, id_usuario=1, anexo_bytes=anexo, anexo_hash=anexo_hash,
+                impressao_digital=crud.impressao_denuncia("CPF", chave, str(i), anexo_hash),
+                tipo_chave_pix=rnd.choice(("CPF", "Telefone", "E-mail")), chave_pix=chave,
+                nome_conta=gerar_nome(rnd), numero_bo=str(i), cpf_cnpj=chave,
+                banco=rnd.choice(("Nubank", "Caixa", "Itaú", "Bradesco")),
+                agencia=None, conta=None, descricao=None
+            )
+        insercao = time.perf_counter() - t0
+
+        consultas = (
+            ("pesquisa sem filtro", lambda: crud.get_denuncias_by_query(db, query=None, tipo=None)),
+            ("pesquisa 'Silva'", lambda: crud.get_denuncias_by_query(db, query="Silva", tipo=None)),
+            ("aproximada 'Joao Sylva'", lambda: crud.get_denuncias_by_nome_aproximado(db, nome="Joao Sylva", tipo=None)),
+        )
+        print(f"\n{nome}: {denuncias / insercao:,.0f} inserções/s")
+        for descricao, consulta in consultas:
+            tempos = []
+            for _ in range(repeticoes):
+                t0 = time.perf_counter()
+                await consulta()
+                tempos.append(time.perf_counter() - t0)
+            print(f"  {descricao:<26} mediana {statistics.median(tempos) * 1000:8.2f} ms "
+                  f"| p99 {percentil(tempos, 0.99) * 1000:8.2f} ms")
+
+    await engine.dispose()
+
+
+def bench_backends(mysql_url: str | None, denuncias: int, repeticoes: int):
+    """
+    Mesma carga (inserções + pesquisas) no SQLite embarcado e, se informado,
+    em um MySQL. O MySQL precisa ser um banco VAZIO, só para o teste.
+    """
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        asyncio.run(_bench_backend("SQLite (WAL)", f"sqlite+aiosqlite:///{caminho}", denuncias, repeticoes))
+    if mysql_url:
+        asyncio.run(_bench_backend("MySQL", mysql_url, denuncias, repeticoes))
+
+
+async def _bench_facetas(url: str, denuncias: int, repeticoes: int):
+    from sqlalchemy import insert
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    import crud
+    import models
+    from database import Base, criar_engine
+
+    engine = criar_engine(url)
+    Sessao = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rnd = random.Random(42)
+    bancos = ["Nubank", "Caixa", "Itaú", "Bradesco", "Santander", "Inter", "C6", "PicPay"]
+    tipos = ["CPF", "CNPJ", "Telefone", "E-mail", "Chave aleatória"]
+    print(f"Gerando {denuncias} denúncias...")
+    async with Sessao() as db:
+        # Carga em lote (o caminho da API é medido em 'backends'); os
+        # contadores e as chaves de nome são preenchidos pelas tarefas.
+        for inicio in range(0, denuncias, 5000):
+            linhas = []
+            for i in range(inicio, min(inicio + 5000, denuncias)):
+                chave = f"{rnd.randrange(10**11):011d}"
+                linhas.append({
+                    "grupo_fraude_id": chave, "tipo_chave_pix": rnd.choice(tipos),
+                    "nome_conta": gerar_nome(rnd), "chave_pix": chave, "numero_bo": str(i),
+                    "banco": rnd.choices(bancos, weights=range(len(bancos), 0, -1))[0],
+                    "cpf_cnpj": chave, "anexo": b"%PDF",
+                })
+            await db.execute(insert(models.Denuncia), linhas)
+            await db.commit()
+        ultimo_id = 0
+        while ultimo_id is not None:
+            ultimo_id = await crud.backfill_chaves_nome(db, ultimo_id=ultimo_id, lote=5000)
+        await crud.recontar_facetas(db)
+
+        cenarios = (
+            ("sem filtro", dict(query=None, tipo=None, banco=None), False),
+            ("tipo=CPF", dict(query=None, tipo="CPF", banco=None), False),
+            ("tipo=CPF + banco", dict(query=None, tipo="CPF", banco="Caixa"), False),
+            ("texto 'Silva'", dict(query="Silva", tipo=None, banco=None), False),
+            ("aproximada 'Joao Sylva'", dict(query="Joao Sylva", tipo=None, banco=None), True),
+        )
+
+        async def pesquisar(filtros, aproximado):
+            if aproximado:
+                return await crud.get_denuncias_by_nome_aproximado(
+                    db, nome=filtros["query"], tipo=filtros["tipo"], banco=filtros["banco"]
+                )
+            return await crud.get_denuncias_by_query(db, **filtros)
+
+        print(f"{'':<26} {'pesquisa':>12} {'com facetas':>12} {'diferença':>10}   (medianas)")
+        for nome, filtros, aproximado in cenarios:
+            sem, com = [], []
+            for _ in range(repeticoes):
+                t0 = time.perf_counter()
+                await pesquisar(filtros, aproximado)
+                t1 = time.perf_counter()
+                await crud.get_denuncias_e_facetas(db, desde=None, aproximado=aproximado, **filtros)
+                t2 = time.perf_counter()
+                sem.append(t1 - t0)
+                com.append(t2 - t1)
+            mediana_sem, mediana_com = statistics.median(sem), statistics.median(com)
+            print(f"{nome:<26} {mediana_sem * 1000:9.2f} ms {mediana_com * 1000:9.2f} ms "
+                  f"{(mediana_com / mediana_sem - 1) * 100:+8.1f} %")
+
+    await engine.dispose()
+
+
+def bench_facetas(denuncias: int, repeticoes: int):
+    """
+    Custo das facetas (contagens por banco e tipo de chave) somado à
+    pesquisa, em um SQLite temporário com 'denuncias' denúncias.
+    """
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        asyncio.run(_bench_facetas(f"sqlite+aiosqlite:///{caminho}", denuncias, repeticoes))
+
+
+def bench_sugestoes(valores: int, consultas: int):
+    """
+    Latência do autocompletar (sugestoes.py) com 'valores' valores distintos:
+    o usuário digitando letra a letra, e inserções de denúncias novas.
+    """
+    import sugestoes
+
+    rnd = random.Random(42)
+    print(f"Gerando {valores} valores distintos...")
+    distintos = {}
+    while len(distintos) < valores:
+        if rnd.random() < 0.5:
+            valor = f"{gerar_nome(rnd)} {rnd.randrange(10**4)}"
+        else:
+            valor = f"{rnd.randrange(10**11):011d}"
+        distintos[valor] = rnd.randrange(1, 100)
+
+    indice = sugestoes.IndicePrefixos()
+    t0 = time.perf_counter()
+    indice.carregar(distintos.items())
+    print(f"Índice carregado em {time.perf_counter() - t0:.1f}s")
+
+    lista = list(distintos)
+    tempos = []
+    for _ in range(consultas):
+        digitado = rnd.choice(lista)
+        for tamanho in range(1, min(len(digitado), 12) + 1):
+            t0 = time.perf_counter()
+            indice.buscar(digitado[:tamanho], 8)
+            tempos.append(time.perf_counter() - t0)
+
+    insercoes = []
+    for _ in range(1000):
+        valor = rnd.choice(lista) if rnd.random() < 0.7 else gerar_nome(rnd)
+        t0 = time.perf_counter()
+        indice.adicionar(valor)
+        insercoes.append(time.perf_counter() - t0)
+
+    print(f"Busca por prefixo ({len(tempos)} buscas): mediana {statistics.median(tempos) * 1000:.3f} ms "
+          f"| p99 {percentil(tempos, 0.99) * 1000:.3f} ms | máx {max(tempos) * 1000:.1f} ms")
+    print(f"Denúncia nova no índice: mediana {statistics.median(insercoes) * 1000:.3f} ms "
+          f"| p99 {percentil(insercoes, 0.99) * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks locais do De Olho no Pix")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p_nomes = sub.add_parser("nomes", help="Recall e latência da busca aproximada por nome")
+    p_nomes.add_argument("--total", type=int, default=1_000_000, help="Quantidade de nomes gerados")
+    p_nomes.add_argument("--consultas", type=int, default=200)
+    p_nomes.add_argument("--url", help="URL de um banco VAZIO (padrão: SQLite temporário)")
+    p_nomes.add_argument("--semente", type=int, default=42)
+
+    p_serial = sub.add_parser("serializacao", help="Custo por linha da resposta da pesquisa")
+    p_serial.add_argument("--linhas", type=int, default=10_000)
+    p_serial.add_argument("--repeticoes", type=int, default=20)
+
+    p_part = sub.add_parser("particionamento", help="Latência da pesquisa com e sem poda de partições")
+    p_part.add_argument("--dias", type=int, default=90, help="Janela da busca 'recente'")
+    p_part.add_argument("--repeticoes", type=int, default=20)
+
+    p_sug = sub.add_parser("sugestoes", help="Latência do autocompletar por prefixo")
+    p_sug.add_argument("--valores", type=int, default=3_000_000, help="Valores distintos no índice")
+    p_sug.add_argument("--consultas", type=int, default=2000, help="Valores 'digitados' letra a letra")
+
+    p_back = sub.add_parser("backends", help="Compara o SQLite embarcado com um MySQL")
+    p_back.add_argument("--mysql-url", help="URL de um banco MySQL VAZIO (opcional)")
+    p_back.add_argument("--denuncias", type=int, default=5000)
+    p_back.add_argument("--repeticoes", type=int, default=20)
+
+    p_fac = sub.add_parser("facetas", help="Pesquisa com e sem as contagens por banco / tipo de chave")
+    p_fac.add_argument("--denuncias", type=int, default=200_000)
+    p_fac.add_argument("--repeticoes", type=int, default=20)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "nomes":
+        bench_nomes(args.url, args.total, args.consultas, args.semente)
+    elif args.benchmark == "serializacao":
+        bench_serializacao(args.linhas, args.repeticoes)
+    elif args.benchmark == "particionamento":
+        bench_particionamento(args.dias, args.repeticoes)
+    elif args.benchmark == "sugestoes":
+        bench_sugestoes(args.valores, args.consultas)
+    elif args.benchmark == "backends":
+        bench_backends(args.mysql_url, args.denuncias, args.repeticoes)
+    elif args.benchmark == "facetas":
+        bench_facetas(args.denuncias, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+# ==================================
+#   BUSCA APROXIMADA DE NOMES
+# ==================================
+# Os golpistas usam contas "laranja" e quem denuncia digita o nome
+# do jeito que lembra: "Joao da Silva", "João Silva", "Joao Sylva"...
+# Aqui geramos CHAVES DE BLOQUEIO (fonéticas, pensadas para nomes
+# brasileiros) que são gravadas junto com a denúncia. Na busca, só
+# as denúncias que compartilham essas chaves viram candidatas, e a
+# similaridade (mais cara) é calculada apenas sobre elas.
+
+# Partículas que não ajudam a distinguir nomes
+PARTICULAS = {"d", "da", "de", "di", "do", "du", "das", "dos", "e"}
+
+# Nota mínima (0 a 1) para um candidato aparecer no resultado
+SIMILARIDADE_MINIMA = 0.7
+
+VOGAIS = set("aeiou")
+
+# Regras fonéticas aplicadas em ordem (depois de remover acentos).
+# O 'ç' vira 'c' junto com os acentos: muita gente digita sem cedilha,
+# então 'Gonçalves' e 'Goncalves' precisam dar a MESMA chave.
+REGRAS_FONETICAS = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"th"), "t"),
+    (re.compile(r"[cs]h"), "x"),
+    (re.compile(r"lh"), "l"),
+    (re.compile(r"nh"), "n"),
+    (re.compile(r"[sx]c(?=[ei])"), "s"),
+    (re.compile(r"qu|q"), "k"),
+    (re.compile(r"c(?=[ei])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"g(?=[ei])"), "j"),
+    (re.compile(r"gu(?=[ei])"), "g"),
+    (re.compile(r"y"), "i"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"m$"), "n"),
+]
+
+
+def remover_acentos(texto: str) -> str:
+    """Remove acentos e cedilha: 'João Conceição' -> 'Joao Conceicao'."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokens_nome(nome: str) -> list[str]:
+    """
+    Quebra o nome em palavras minúsculas, sem acentos,
+    sem partículas ('da', 'dos'...) e sem iniciais soltas.
+    """
+    texto = remover_acentos(nome.lower())
+    palavras = re.findall(r"[a-z]+", texto)
+    return [p for p in palavras if p not in PARTICULAS and len(p) > 1]
+
+
+def normalizar_nome(nome: str) -> str:
+    """'Joao da Silva' e 'João Silva' viram o mesmo texto: 'joao silva'."""
+    return " ".join(tokens_nome(nome))
+
+
+# Nomes se repetem muito: o cache deixa o backfill bem mais rápido
+@lru_cache(maxsize=65536)
+def chave_fonetica(palavra: str) -> str:
+    """
+    Gera a chave fonética de UMA palavra.
+    Mantém a primeira letra e o "esqueleto" de consoantes,
+    então 'Souza'/'Sousa', 'Luiz'/'Luis', 'Thiago'/'Tiago' e
+    'Gonçalves'/'Goncalves' batem.
+    """
+    texto = remover_acentos(palavra.lower())
+    texto = re.sub(r"[^a-z]", "", texto)
+    for padrao, troca in REGRAS_FONETICAS:
+        texto = padrao.sub(troca, texto)
+    if not texto:
+        return ""
+
+    # Tira as vogais (menos a primeira letra) e junta letras repetidas
+    esqueleto = texto[0] + "".join(c for c in texto[1:] if c not in VOGAIS)
+    esqueleto = re.sub(r"(.)\1+", r"\1", esqueleto)
+
+    # Palavras quase só de vogais ('João') ficariam curtas demais
+    if len(esqueleto) < 2:
+        return re.sub(r"(.)\1+", r"\1", texto)
+    return esqueleto
+
+
+def chaves_nome(nome: str) -> set[str]:
+    """Conjunto de chaves de bloqueio de um nome completo."""
+    return {chave for chave in map(chave_fonetica, tokens_nome(nome)) if chave}
+
+
+def minimo_chaves(total: int) -> int:
+    """
+    Quantas chaves um candidato precisa compartilhar com a busca.
+    Nomes com 3+ palavras toleram uma palavra errada ou faltando.
+    """
+    return total - 1 if total >= 3 else total
+
+
+def similaridade(nome_a: str, nome_b: str) -> float:
+    """Nota de 0 a 1 entre dois nomes, já normalizados."""
+    return SequenceMatcher(None, nome_a, nome_b).ratio()
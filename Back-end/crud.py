@@ -1,8 +1,21 @@
 import bcrypt
+import hashlib
+import re
+import sqlite3
+from collections import Counter, namedtuple
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select, or_, func, update, case
+from sqlalchemy.sql import select, and_, or_, func, update, case, delete, insert
 # Importamos os arquivos que já criamos
 import models, schemas
+import busca_nomes
+import dialetos
+import serializacao
+from database import fila_escrita
+
+# Máximo de denúncias candidatas avaliadas na busca aproximada por nome
+LIMITE_CANDIDATOS_NOME = 500
 # ==================================
 #         FUNÇÕES DE SENHA
 # ==================================
@@ -22,6 +35,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_bytes, hashed_bytes)
 
 
+# ==================================
+#    FUNÇÕES DE IMPRESSÃO DIGITAL
+# ==================================
+# Identificam a MESMA denúncia enviada mais de uma vez,
+# mesmo que a chave venha com outra máscara ou espaços.
+
+def hash_anexo(anexo_bytes: bytes) -> str:
+    """SHA-256 (hex) do arquivo do B.O."""
+    return hashlib.sha256(anexo_bytes).hexdigest()
+
+
+def canonizar_chave_pix(tipo_chave_pix: str, chave_pix: str) -> str:
+    """'(11) 99999-9999' e '11999999999' são a mesma chave."""
+    chave = chave_pix.strip()
+    if tipo_chave_pix in ('Telefone', 'CPF', 'CNPJ'):
+        return re.sub(r'\D', '', chave)
+    if tipo_chave_pix == 'E-mail':
+        return chave.lower()
+    return chave
+
+
+def impressao_denuncia(tipo_chave_pix: str, chave_pix: str, numero_bo: str, anexo_hash: str) -> str:
+    """Impressão digital da denúncia: chave canônica + B.O. + hash do anexo."""
+    numero_bo_canonico = re.sub(r'[^0-9A-Z]', '', numero_bo.upper())
+    partes = (canonizar_chave_pix(tipo_chave_pix, chave_pix), numero_bo_canonico, anexo_hash)
+    return hashlib.sha256('|'.join(partes).encode('utf-8')).hexdigest()
+
+
 # ==================================
 #         CRUD DE USUÁRIO
 # ==================================
@@ -47,8 +88,9 @@ async def create_user(db: AsyncSession, user: schemas.UsuarioCreate) -> models.U
         senha_hash=hashed_password  # Salva o HASH, nunca a senha pura
     )
     
-    db.add(db_user)
-    await db.commit()
+    async with fila_escrita():
+        db.add(db_user)
+        await db.commit()
     await db.refresh(db_user)
     return db_user
 
@@ -57,75 +99,404 @@ async def create_user(db: AsyncSession, user: schemas.UsuarioCreate) -> models.U
 #        CRUD DE DENÚNCIA
 # ==================================
 
-async def get_denuncias_by_query(
-    db: AsyncSession, 
-    query: str | None, 
-    tipo: str | None
-) -> list[tuple]:
+def _select_denuncias_agrupadas(desde: datetime | None = None, por_tipo: bool = False):
     """
-    Busca denúncias AGRUPADAS por grupo_fraude_id.
-    Retorna uma lista de tuplas com os dados do grupo e a contagem.
+    Monta o SELECT base da pesquisa: denúncias AGRUPADAS por grupo_fraude_id,
+    com as chaves agregadas e a contagem. Os filtros são aplicados por quem chama,
+    menos o 'desde' (data mínima), que fica aqui para o MySQL podar as partições.
+    Com 'por_tipo', cada grupo sai em uma linha por tipo de chave (facetas).
     """
 
     # --- LÓGICA DE AGREGAÇÃO DE CHAVES ---
     # Vamos criar uma string com todas as chaves,
     # exceto "Chave aleatória"
-    # --- LÓGICA DE AGREGAÇÃO DE CHAVES (CORRIGIDA) ---
 
-    # 1. Primeiro, criamos a lógica do 'DISTINCT' e 'CASE'
-    distinct_chaves_com_case = func.distinct(
-        case(
-            (models.Denuncia.tipo_chave_pix != 'Chave aleatória', models.Denuncia.chave_pix),
-            else_=None
-        )
+    # 1. Primeiro, o 'CASE' que descarta as chaves aleatórias
+    chaves_com_case = case(
+        (models.Denuncia.tipo_chave_pix != 'Chave aleatória', models.Denuncia.chave_pix),
+        else_=None
     )
-    
-    # 2. Agora, aplicamos o GROUP_CONCAT usando o operador .op()
-    # Isso gera o SQL: GROUP_CONCAT(... SEPARATOR '\n')
-    chaves_agregadas = func.group_concat(
-        distinct_chaves_com_case.op('SEPARATOR')('\n')
+
+    # 2. Agora, juntamos as chaves DISTINTAS, uma por linha.
+    # No MySQL isso gera: GROUP_CONCAT(DISTINCT ... SEPARATOR '\n')
+    # (veja dialetos.py para o SQL dos outros bancos)
+    chaves_agregadas = dialetos.agregar_distintos(
+        chaves_com_case, '\n'
     ).label("chave_pix_exemplo")
-# -----------------------------------
     # -----------------------------------
 
+    colunas_grupo = [
+        models.Denuncia.grupo_fraude_id,
+        models.Denuncia.nome_conta,
+        models.Denuncia.cpf_cnpj,
+        models.Denuncia.banco
+    ]
+    if por_tipo:
+        colunas_grupo.append(models.Denuncia.tipo_chave_pix)
+
     statement = select(
         models.Denuncia.nome_conta,
         models.Denuncia.cpf_cnpj,
         models.Denuncia.banco,
         chaves_agregadas, # <-- MUDANÇA AQUI
         func.count(models.Denuncia.id_denuncia).label("total_denuncias")
-    ).group_by(
-        models.Denuncia.grupo_fraude_id,
-        models.Denuncia.nome_conta,
-        models.Denuncia.cpf_cnpj,
-        models.Denuncia.banco
-    ).order_by(
+    )
+    if por_tipo:
+        statement = statement.add_columns(
+            models.Denuncia.grupo_fraude_id, models.Denuncia.tipo_chave_pix
+        )
+
+    # Só as partições (meses) a partir de 'desde' são lidas
+    if desde:
+        statement = statement.filter(models.Denuncia.data_denuncia >= desde)
+
+    return statement.group_by(*colunas_grupo).order_by(
         func.count(models.Denuncia.id_denuncia).desc()
     )
 
+
+def _filtro_texto(query: str):
+    """Filtro do termo de busca livre: LIKE em vários campos."""
+    like_query = f"%{query}%"
+    return or_(
+        models.Denuncia.chave_pix.like(like_query),
+        models.Denuncia.nome_conta.like(like_query),
+        models.Denuncia.banco.like(like_query),
+        models.Denuncia.numero_bo.like(like_query),
+        models.Denuncia.cpf_cnpj.like(like_query)
+    )
+
+
+async def get_denuncias_by_query(
+    db: AsyncSession, 
+    query: str | None, 
+    tipo: str | None,
+    desde: datetime | None = None,
+    banco: str | None = None
+) -> list[tuple]:
+    """
+    Busca denúncias AGRUPADAS por grupo_fraude_id.
+    Retorna uma lista de tuplas com os dados do grupo e a contagem.
+    """
+    statement = _select_denuncias_agrupadas(desde)
+
     # Filtro 1: Pelo termo de busca (query)
     if query:
-        like_query = f"%{query}%"
-        statement = statement.filter(
-            or_(
-                models.Denuncia.chave_pix.like(like_query),
-                models.Denuncia.nome_conta.like(like_query),
-                models.Denuncia.banco.like(like_query),
-                models.Denuncia.numero_bo.like(like_query),
-                models.Denuncia.cpf_cnpj.like(like_query)
+        statement = statement.filter(_filtro_texto(query))
+
+    # Filtros 2 e 3: Pelo tipo de chave (do amigo) e pelo banco
+    # (valor exato, como vem das facetas)
+    statement = statement.filter(*_filtros_tipo_banco(tipo, banco, relaxar=False))
+
+    result = await db.execute(statement)
+    return result.all()
+
+def _filtros_tipo_banco(tipo: str | None, banco: str | None, relaxar: bool) -> list:
+    """
+    Filtros de tipo e banco para o SQL. Com 'relaxar' (pesquisa com facetas),
+    só ficam de fora as linhas que NENHUMA faceta conta: cada faceta ignora
+    o próprio filtro, então com os dois filtros vale 'tipo OU banco'.
+    """
+    if relaxar:
+        if tipo and banco:
+            return [or_(models.Denuncia.tipo_chave_pix == tipo, models.Denuncia.banco == banco)]
+        return []
+    filtros = []
+    if tipo:
+        filtros.append(models.Denuncia.tipo_chave_pix == tipo)
+    if banco:
+        filtros.append(models.Denuncia.banco == banco)
+    return filtros
+
+
+async def _grupos_candidatos(
+    db: AsyncSession,
+    nome: str,
+    tipo: str | None,
+    banco: str | None,
+    desde: datetime | None,
+    relaxar: bool = False
+) -> list[str]:
+    """
+    Grupos (grupo_fraude_id) cujo nome compartilha chaves fonéticas
+    suficientes com 'nome'. O limite vale para GRUPOS, não para denúncias:
+    um nome comum com milhares de denúncias ocupa uma vaga só.
+    Os filtros da pesquisa entram ANTES do limite (basta uma denúncia do
+    grupo passar), senão os 500 primeiros podiam ser todos de outro
+    tipo/banco. Com 'relaxar', os grupos que só as facetas usam também
+    entram, mas DEPOIS dos que passam nos filtros.
+    """
+    chaves = busca_nomes.chaves_nome(nome)
+    if not chaves:
+        return []
+
+    chave_nome = models.DenunciaChaveNome
+    acertos = func.count(func.distinct(chave_nome.chave))
+    minimo = busca_nomes.minimo_chaves(len(chaves))
+
+    statement = select(chave_nome.grupo_fraude_id).filter(chave_nome.chave.in_(chaves))
+    ordem = [acertos.desc(), func.max(chave_nome.id_denuncia).desc()]
+
+    # Sem filtros, tudo sai do índice (chave, grupo, id): o JOIN com
+    # 'denuncias' só custaria caro (uma leitura por chave encontrada)
+    if tipo or banco or desde:
+        statement = statement.join(
+            models.Denuncia, models.Denuncia.id_denuncia == chave_nome.id_denuncia
+        ).filter(*_filtros_tipo_banco(tipo, banco, relaxar))
+        if desde:
+            statement = statement.filter(models.Denuncia.data_denuncia >= desde)
+        filtros = _filtros_tipo_banco(tipo, banco, relaxar=False)
+        if relaxar and filtros:
+            ordem.insert(0, func.max(case((and_(*filtros), 1), else_=0)).desc())
+
+    # Empate no número de chaves (comum: toda busca de 2 palavras dá 2):
+    # os grupos com denúncia mais recente primeiro, sempre na mesma ordem
+    statement = statement.group_by(
+        chave_nome.grupo_fraude_id
+    ).having(
+        acertos >= minimo
+    ).order_by(*ordem).limit(LIMITE_CANDIDATOS_NOME)
+
+    return (await db.execute(statement)).scalars().all()
+
+
+async def _pesquisa_nome_aproximado(
+    db: AsyncSession,
+    nome: str,
+    tipo: str | None,
+    banco: str | None,
+    desde: datetime | None,
+    com_facetas: bool
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    Busca APROXIMADA pelo nome da conta ('Joao da Silva' acha 'João Silva').
+    1. Usa as chaves fonéticas (indexadas) para escolher os grupos candidatos.
+    2. Agrupa esses grupos INTEIROS, com os mesmos filtros da busca normal
+       (a contagem e as chaves não dependem do limite de candidatos).
+    3. Calcula a similaridade UMA vez por nome e ordena por ela.
+    Retorna (grupos, pares (tipo, banco, total) dos aprovados, para as facetas).
+    """
+    grupos = await _grupos_candidatos(db, nome, tipo, banco, desde, relaxar=com_facetas)
+    if not grupos:
+        return [], []
+
+    nome_busca = busca_nomes.normalizar_nome(nome)
+    notas = {}
+
+    def aprovado(nome_conta: str) -> bool:
+        if nome_conta not in notas:
+            notas[nome_conta] = busca_nomes.similaridade(
+                nome_busca, busca_nomes.normalizar_nome(nome_conta)
             )
+        return notas[nome_conta] >= busca_nomes.SIMILARIDADE_MINIMA
+
+    filtro_grupos = models.Denuncia.grupo_fraude_id.in_(grupos)
+    if com_facetas:
+        linhas, pares = await _pesquisa_por_tipo(db, [filtro_grupos], tipo, banco, desde, aprovado)
+    else:
+        statement = _select_denuncias_agrupadas(desde).filter(
+            filtro_grupos, *_filtros_tipo_banco(tipo, banco, relaxar=False)
         )
+        linhas = [linha for linha in (await db.execute(statement)).all() if aprovado(linha.nome_conta)]
+        pares = []
 
-    # Filtro 2: Pelo tipo de chave (do amigo)
-    if tipo:
-        statement = statement.filter(models.Denuncia.tipo_chave_pix == tipo)
+    linhas.sort(key=lambda linha: (notas[linha.nome_conta], linha.total_denuncias), reverse=True)
+    return linhas, pares
+
+
+async def get_denuncias_by_nome_aproximado(
+    db: AsyncSession,
+    nome: str,
+    tipo: str | None,
+    desde: datetime | None = None,
+    banco: str | None = None
+) -> list[tuple]:
+    """Busca APROXIMADA pelo nome da conta (veja _pesquisa_nome_aproximado)."""
+    linhas, _ = await _pesquisa_nome_aproximado(db, nome, tipo, banco, desde, com_facetas=False)
+    return linhas
+
+
+# ==================================
+#     FACETAS (BANCO E TIPO DE CHAVE)
+# ==================================
+# Cada faceta ignora o PRÓPRIO filtro (a de banco respeita só o tipo,
+# e vice-versa), para a tela mostrar as outras opções disponíveis.
+# A pesquisa com facetas faz UMA passada pelas denúncias (ou lê os
+# contadores) e dela saem os grupos e os pares (tipo, banco, total).
 
+# Linha de resultado montada em Python (mesmos campos da consulta agrupada)
+GrupoDenuncias = namedtuple("GrupoDenuncias", serializacao.CAMPOS_DENUNCIA_AGRUPADA)
+
+
+async def get_denuncias_e_facetas(
+    db: AsyncSession,
+    query: str | None,
+    tipo: str | None,
+    banco: str | None,
+    desde: datetime | None,
+    aproximado: bool
+) -> tuple[list[tuple], dict[str, list[tuple]]]:
+    """
+    A pesquisa (grupos) e a contagem de denúncias por 'banco' e por
+    'tipo_chave_pix'. Sem termo de busca nem data, as facetas vêm dos
+    contadores (tabela pequena); senão, da mesma consulta dos grupos.
+    """
+    if aproximado:
+        linhas, pares = await _pesquisa_nome_aproximado(db, query, tipo, banco, desde, com_facetas=True)
+    elif not query and not desde:
+        linhas = await get_denuncias_by_query(db, query=None, tipo=tipo, banco=banco)
+        contagem = models.ContagemDenuncias
+        result = await db.execute(
+            select(contagem.tipo_chave_pix, contagem.banco, contagem.total).filter(contagem.total > 0)
+        )
+        pares = result.all()
+    else:
+        filtros = [_filtro_texto(query)] if query else []
+        linhas, pares = await _pesquisa_por_tipo(db, filtros, tipo, banco, desde)
+
+    por_banco, por_tipo = Counter(), Counter()
+    for tipo_par, banco_par, total in pares:
+        if not tipo or tipo_par == tipo:
+            por_banco[banco_par] += total
+        if not banco or banco_par == banco:
+            por_tipo[tipo_par] += total
+    return linhas, {"banco": por_banco.most_common(), "tipo_chave_pix": por_tipo.most_common()}
+
+
+def _somar_linha(soma: dict, chaves: str | None, total: int):
+    if chaves:
+        soma["chaves"].update(dict.fromkeys(chaves.split("\n")))
+    soma["total"] += total
+
+
+async def _pesquisa_por_tipo(
+    db: AsyncSession,
+    filtros: list,
+    tipo: str | None,
+    banco: str | None,
+    desde: datetime | None,
+    aprovado=None
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    A consulta agrupada da pesquisa ('filtros': texto livre ou grupos da
+    busca aproximada), separada também por tipo de chave e com os filtros
+    de tipo/banco relaxados para as facetas. Os grupos do resultado são
+    juntados aqui; os pares (tipo, banco) saem das mesmas linhas.
+    'aprovado(nome_conta)', se informado, descarta grupos pelo nome.
+    """
+    statement = _select_denuncias_agrupadas(desde, por_tipo=True).filter(
+        *filtros, *_filtros_tipo_banco(tipo, banco, relaxar=True)
+    )
+
+    pares = Counter()
+    grupos = {}
+    juntados = {}
+    for linha in (await db.execute(statement)).all():
+        nome_conta, cpf_cnpj, banco_linha, chaves, total, grupo_fraude_id, tipo_linha = linha
+        if aprovado and not aprovado(nome_conta):
+            continue
+        pares[(tipo_linha, banco_linha)] += total
+        if (tipo and tipo_linha != tipo) or (banco and banco_linha != banco):
+            continue
+
+        chave_grupo = (grupo_fraude_id, nome_conta, cpf_cnpj, banco_linha)
+        anterior = grupos.get(chave_grupo)
+        if anterior is None:
+            # Quase todo grupo tem um tipo de chave só: a linha vai como está
+            grupos[chave_grupo] = linha
+            continue
+
+        # O grupo apareceu com outro tipo de chave: junta as duas linhas
+        soma = juntados.get(chave_grupo)
+        if soma is None:
+            soma = juntados[chave_grupo] = {"chaves": {}, "total": 0}
+            _somar_linha(soma, anterior.chave_pix_exemplo, anterior.total_denuncias)
+        _somar_linha(soma, chaves, total)
+        grupos[chave_grupo] = GrupoDenuncias(
+            nome_conta=nome_conta,
+            cpf_cnpj=cpf_cnpj,
+            banco=banco_linha,
+            chave_pix_exemplo="\n".join(soma["chaves"]) or None,
+            total_denuncias=soma["total"],
+        )
+
+    linhas = sorted(grupos.values(), key=lambda linha: linha.total_denuncias, reverse=True)
+    return linhas, [(t, b, total) for (t, b), total in pares.items()]
+
+
+async def recontar_facetas(db: AsyncSession):
+    """
+    Refaz os contadores das facetas a partir da tabela 'denuncias'.
+    Usado na primeira vez e depois das tarefas que apagam denúncias.
+    """
+    contagem = models.ContagemDenuncias
+    async with fila_escrita():
+        await db.execute(delete(contagem))
+        await db.execute(
+            insert(contagem).from_select(
+                ["tipo_chave_pix", "banco", "total"],
+                select(
+                    models.Denuncia.tipo_chave_pix,
+                    models.Denuncia.banco,
+                    func.count(models.Denuncia.id_denuncia)
+                ).group_by(models.Denuncia.tipo_chave_pix, models.Denuncia.banco)
+            )
+        )
+        await db.commit()
+
+
+async def tem_contadores_facetas(db: AsyncSession) -> bool:
+    """Os contadores já foram preenchidos alguma vez?"""
+    result = await db.execute(select(models.ContagemDenuncias.total).limit(1))
+    return result.first() is not None
+
+
+async def get_contagem_por_valor(db: AsyncSession, campo: str) -> list[tuple]:
+    """
+    Quantas denúncias existem para cada valor de um campo
+    ('nome_conta', 'chave_pix' ou 'banco'). Alimenta as sugestões.
+    """
+    coluna = getattr(models.Denuncia, campo)
+    statement = select(coluna, func.count(models.Denuncia.id_denuncia)).group_by(coluna)
     result = await db.execute(statement)
     return result.all()
 
+
+async def get_denuncia_id_by_impressao(db: AsyncSession, impressao_digital: str) -> int | None:
+    """Procura (pela chave primária do registro) uma denúncia com a mesma impressão digital."""
+    statement = select(models.ImpressaoDenuncia.id_denuncia).filter(
+        models.ImpressaoDenuncia.impressao_digital == impressao_digital
+    )
+    result = await db.execute(statement)
+    return result.scalars().first()
+
+
+# Código de "chave duplicada" do MySQL / MariaDB (ER_DUP_ENTRY)
+MYSQL_CHAVE_DUPLICADA = 1062
+
+
+def violou_impressao_digital(erro: IntegrityError) -> bool:
+    """
+    A IntegrityError foi a chave primária de 'impressoes_denuncias'
+    (a mesma denúncia gravada ao mesmo tempo por outra requisição)?
+    É a única chave única que a gravação da denúncia pode repetir, então
+    basta o código de chave duplicada do driver. O texto da mensagem
+    muda com a versão (o MySQL antes do 8.0.19 e o MariaDB dizem só 'PRIMARY').
+    """
+    original = erro.orig
+    if isinstance(original, sqlite3.IntegrityError):
+        return original.sqlite_errorcode in (
+            sqlite3.SQLITE_CONSTRAINT_PRIMARYKEY, sqlite3.SQLITE_CONSTRAINT_UNIQUE
+        )
+    return bool(original.args) and original.args[0] == MYSQL_CHAVE_DUPLICADA
+
+
 async def create_denuncia(
     db: AsyncSession, 
+    id_usuario: int,
     anexo_bytes: bytes,
+    anexo_hash: str,
+    impressao_digital: str,
     tipo_chave_pix: str,
     chave_pix: str,
     nome_conta: str,
@@ -143,7 +514,7 @@ async def create_denuncia(
 
     # --- LÓGICA DE AGRUPAMENTO ATUALIZADA ---
     # O grupo agora é SEMPRE definido pela conta, não pela chave.
-    grupo_fraude_id = f"{nome_conta.lower().strip()}_{cpf_cnpj.strip()}"
+    grupo_fraude_id = grupo_fraude(nome_conta, cpf_cnpj)
     # ----------------------------------------
 
     db_denuncia = models.Denuncia(
@@ -157,15 +528,99 @@ async def create_denuncia(
         agencia=agencia,
         conta=conta,
         descricao=descricao,
-        grupo_fraude_id=grupo_fraude_id
+        grupo_fraude_id=grupo_fraude_id,
+        id_usuario=id_usuario,
+        anexo_hash=anexo_hash,
+        impressao_digital=impressao_digital
     )
 
-    db.add(db_denuncia)
-    await db.commit()
+    async with fila_escrita():
+        db.add(db_denuncia)
+        # Precisamos do id gerado para gravar as chaves de busca do nome
+        # e o registro da impressão digital (que barra duplicatas)
+        await db.flush()
+        db.add_all(_chaves_nome_denuncia(db_denuncia.id_denuncia, nome_conta, grupo_fraude_id))
+        db.add(models.ImpressaoDenuncia(
+            impressao_digital=impressao_digital, id_denuncia=db_denuncia.id_denuncia
+        ))
+        # +1 no contador das facetas, na mesma transação
+        await db.execute(dialetos.inserir_ou_somar(
+            db.bind.dialect.name,
+            models.ContagemDenuncias.__table__,
+            {"tipo_chave_pix": tipo_chave_pix, "banco": banco, "total": 1},
+            "total"
+        ))
+
+        await db.commit()
     await db.refresh(db_denuncia)
     return db_denuncia
 
 
+def grupo_fraude(nome_conta: str, cpf_cnpj: str) -> str:
+    """O grupo de uma denúncia: a conta (nome + CPF/CNPJ), não a chave."""
+    return f"{nome_conta.lower().strip()}_{cpf_cnpj.strip()}"
+
+
+def _chaves_nome_denuncia(id_denuncia: int, nome_conta: str, grupo_fraude_id: str) -> list[models.DenunciaChaveNome]:
+    """Cria as linhas de chaves fonéticas do nome de uma denúncia."""
+    return [
+        models.DenunciaChaveNome(id_denuncia=id_denuncia, grupo_fraude_id=grupo_fraude_id, chave=chave)
+        for chave in busca_nomes.chaves_nome(nome_conta)
+    ]
+
+
+async def backfill_chaves_nome(db: AsyncSession, ultimo_id: int, lote: int) -> int | None:
+    """
+    Gera as chaves de busca do nome para um LOTE de denúncias antigas
+    (id > ultimo_id). Retorna o último id processado, ou None se acabou.
+    As denúncias de antes do agrupamento (sem grupo_fraude_id) ganham o
+    grupo, que a busca aproximada usa. Pode ser rodado de novo sem duplicar chaves.
+    """
+    statement = select(
+        models.Denuncia.id_denuncia,
+        models.Denuncia.nome_conta,
+        models.Denuncia.cpf_cnpj,
+        models.Denuncia.grupo_fraude_id
+    ).filter(
+        models.Denuncia.id_denuncia > ultimo_id
+    ).order_by(
+        models.Denuncia.id_denuncia
+    ).limit(lote)
+    linhas = (await db.execute(statement)).all()
+    if not linhas:
+        return None
+
+    ids = [linha.id_denuncia for linha in linhas]
+    async with fila_escrita():
+        await db.execute(
+            delete(models.DenunciaChaveNome).filter(models.DenunciaChaveNome.id_denuncia.in_(ids))
+        )
+        for linha in linhas:
+            grupo_fraude_id = linha.grupo_fraude_id
+            if grupo_fraude_id is None:
+                grupo_fraude_id = grupo_fraude(linha.nome_conta, linha.cpf_cnpj)
+                await db.execute(
+                    update(models.Denuncia).filter(
+                        models.Denuncia.id_denuncia == linha.id_denuncia
+                    ).values(grupo_fraude_id=grupo_fraude_id)
+                )
+            db.add_all(_chaves_nome_denuncia(linha.id_denuncia, linha.nome_conta, grupo_fraude_id))
+
+        await db.commit()
+    return ids[-1]
+
+
+async def get_denuncia_by_id(db: AsyncSession, denuncia_id: int) -> tuple | None:
+    """
+    Busca os dados de UMA denúncia, SEM o arquivo (BLOB).
+    Retorna uma linha (tupla) com as colunas publicadas, ou None.
+    """
+    colunas = [getattr(models.Denuncia, campo) for campo in serializacao.CAMPOS_DENUNCIA]
+    statement = select(*colunas).filter(models.Denuncia.id_denuncia == denuncia_id)
+    result = await db.execute(statement)
+    return result.first()
+
+
 async def get_denuncia_anexo_by_id(db: AsyncSession, denuncia_id: int) -> bytes | None:
     """
     Busca APENAS o arquivo (BLOB) de uma denúncia específica.
@@ -177,6 +632,135 @@ async def get_denuncia_anexo_by_id(db: AsyncSession, denuncia_id: int) -> bytes
     result = await db.execute(statement)
     return result.scalars().first() # Retorna os bytes do arquivo ou None
 
+async def colapsar_duplicadas_lote(db: AsyncSession, ultimo_id: int, lote: int) -> tuple[int | None, int]:
+    """
+    Calcula a impressão digital de um LOTE de denúncias (id > ultimo_id)
+    e apaga as repetidas. Fica a denúncia que já tinha a impressão gravada
+    ou, se nenhuma tinha, a mais antiga (menor id).
+    Retorna (último id processado ou None se acabou, quantas foram apagadas).
+    """
+    statement = select(
+        models.Denuncia.id_denuncia,
+        models.Denuncia.tipo_chave_pix,
+        models.Denuncia.chave_pix,
+        models.Denuncia.numero_bo,
+        models.Denuncia.anexo_hash,
+        models.Denuncia.impressao_digital
+    ).filter(
+        models.Denuncia.id_denuncia > ultimo_id
+    ).order_by(
+        models.Denuncia.id_denuncia
+    ).limit(lote)
+    linhas = (await db.execute(statement)).all()
+    if not linhas:
+        return None, 0
+
+    # Só baixamos o BLOB das linhas que ainda não têm o hash do anexo
+    sem_hash = [linha.id_denuncia for linha in linhas if linha.anexo_hash is None]
+    hashes = {}
+    if sem_hash:
+        anexos = await db.execute(
+            select(models.Denuncia.id_denuncia, models.Denuncia.anexo).filter(
+                models.Denuncia.id_denuncia.in_(sem_hash)
+            )
+        )
+        hashes = {id_denuncia: hash_anexo(anexo) for id_denuncia, anexo in anexos.all()}
+
+    impressoes = {}
+    for linha in linhas:
+        anexo_hash = linha.anexo_hash or hashes[linha.id_denuncia]
+        impressoes[linha.id_denuncia] = (
+            anexo_hash,
+            impressao_denuncia(linha.tipo_chave_pix, linha.chave_pix, linha.numero_bo, anexo_hash)
+        )
+
+    # Impressões que já pertencem a OUTRAS denúncias (inclusive arquivadas)
+    ja_gravadas = await db.execute(
+        select(models.ImpressaoDenuncia.impressao_digital, models.ImpressaoDenuncia.id_denuncia).filter(
+            models.ImpressaoDenuncia.impressao_digital.in_({imp for _, imp in impressoes.values()})
+        )
+    )
+    dona = dict(ja_gravadas.all())
+
+    repetidas = []
+    async with fila_escrita():
+        for id_denuncia, (anexo_hash, impressao) in impressoes.items():
+            if impressao not in dona:
+                dona[impressao] = id_denuncia
+                db.add(models.ImpressaoDenuncia(impressao_digital=impressao, id_denuncia=id_denuncia))
+            elif dona[impressao] != id_denuncia:
+                repetidas.append(id_denuncia)
+                continue
+            await db.execute(
+                update(models.Denuncia).filter(
+                    models.Denuncia.id_denuncia == id_denuncia
+                ).values(anexo_hash=anexo_hash, impressao_digital=impressao)
+            )
+
+        if repetidas:
+            await db.execute(
+                delete(models.DenunciaChaveNome).filter(models.DenunciaChaveNome.id_denuncia.in_(repetidas))
+            )
+            await db.execute(
+                delete(models.Denuncia).filter(models.Denuncia.id_denuncia.in_(repetidas))
+            )
+
+        await db.commit()
+    return linhas[-1].id_denuncia, len(repetidas)
+
+
+# ==================================
+#     ARQUIVAMENTO (MESES ANTIGOS)
+# ==================================
+
+async def get_data_denuncia_mais_antiga(db: AsyncSession) -> datetime | None:
+    """Data da denúncia mais antiga que ainda está no banco."""
+    result = await db.execute(select(func.min(models.Denuncia.data_denuncia)))
+    return result.scalar()
+
+
+async def get_denuncias_do_periodo_lote(
+    db: AsyncSession,
+    inicio: datetime,
+    fim: datetime,
+    ultimo_id: int,
+    lote: int
+) -> list[dict]:
+    """
+    Um LOTE de denúncias completas (com anexo) de 'inicio' até antes de 'fim',
+    com id > ultimo_id. Usado para copiar um mês para o arquivo frio.
+    """
+    statement = select(*models.Denuncia.__table__.columns).filter(
+        models.Denuncia.data_denuncia >= inicio,
+        models.Denuncia.data_denuncia < fim,
+        models.Denuncia.id_denuncia > ultimo_id
+    ).order_by(
+        models.Denuncia.id_denuncia
+    ).limit(lote)
+    result = await db.execute(statement)
+    return [dict(linha) for linha in result.mappings().all()]
+
+
+async def remover_denuncias_arquivadas(db: AsyncSession, ids: list[int], apagar_denuncias: bool, lote: int = 1000):
+    """
+    Tira do banco o que já foi para o arquivo frio: as chaves de busca
+    do nome e, se a partição não foi derrubada, as próprias denúncias.
+    Tudo em UMA transação, para o mês nunca ficar pela metade.
+    (O registro de impressões fica, para barrar reenvio de denúncia antiga.)
+    """
+    async with fila_escrita():
+        for i in range(0, len(ids), lote):
+            pedaco = ids[i:i + lote]
+            await db.execute(
+                delete(models.DenunciaChaveNome).filter(models.DenunciaChaveNome.id_denuncia.in_(pedaco))
+            )
+            if apagar_denuncias:
+                await db.execute(
+                    delete(models.Denuncia).filter(models.Denuncia.id_denuncia.in_(pedaco))
+                )
+        await db.commit()
+
+
 async def update_user(db: AsyncSession, user: models.Usuario, updates: schemas.UsuarioUpdate) -> models.Usuario:
     """
     Atualiza o perfil de um usuário (email, telefone, senha).
@@ -201,7 +785,8 @@ async def update_user(db: AsyncSession, user: models.Usuario, updates: schemas.U
         user.telefone = update_data["telefone"]
 
     # Salva as mudanças no banco
-    db.add(user)
-    await db.commit()
+    async with fila_escrita():
+        db.add(user)
+        await db.commit()
     await db.refresh(user)
-    return user
\ No newline at end of file
+    return user
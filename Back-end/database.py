@@ -1,6 +1,9 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from urllib.parse import quote_plus  # <-- NOVO IMPORT para senhas
 
@@ -27,15 +30,44 @@ elif DB_USER:
 else:
     auth_part = ""  # Sem usuário, sem senha
 
-DATABASE_URL = f"mysql+asyncmy://{auth_part}{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-# 3. O resto do seu arquivo continua exatamente igual
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    pool_pre_ping=True
+# 4. DATABASE_URL (opcional) tem prioridade. Exemplo do modo embarcado,
+#    sem servidor MySQL: DATABASE_URL=sqlite+aiosqlite:///./de_olho_no_pix.db
+DATABASE_URL = (
+    os.getenv("DATABASE_URL")
+    or f"mysql+asyncmy://{auth_part}{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
+# Ajustes do SQLite: WAL deixa leitores e o escritor trabalharem juntos,
+# e o resto troca um pouco de durabilidade/memória por velocidade.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",      # Seguro com WAL (só perde o último commit se a máquina cair)
+    "busy_timeout": "5000",       # Espera até 5s por uma trava em vez de falhar na hora
+    "cache_size": "-64000",       # ~64 MB de cache de páginas
+    "temp_store": "MEMORY",
+    "mmap_size": "268435456",     # 256 MB de leitura via mmap
+    "foreign_keys": "ON",
+}
+
+
+def _aplicar_pragmas_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma, valor in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={valor}")
+    cursor.close()
+
+
+def criar_engine(url: str, **kwargs) -> AsyncEngine:
+    """Cria o engine; no SQLite, aplica os PRAGMAs em toda conexão nova."""
+    engine = create_async_engine(url, pool_pre_ping=True, **kwargs)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _aplicar_pragmas_sqlite)
+    return engine
+
+
+# 5. O resto do seu arquivo continua exatamente igual
+engine = criar_engine(DATABASE_URL, echo=True)
+
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -51,4 +83,23 @@ async def get_db() -> AsyncSession:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+# ==================================
+#   FILA DE ESCRITA (SQLite)
+# ==================================
+# O SQLite aceita UM escritor por vez. Em vez de deixar as requisições
+# brigarem pela trava do arquivo (e estourarem "database is locked"),
+# as escritas entram numa fila dentro do processo. No MySQL não faz nada.
+_trava_escrita = asyncio.Lock() if engine.dialect.name == "sqlite" else None
+
+
+@asynccontextmanager
+async def fila_escrita():
+    """Envolve as escritas (do primeiro INSERT/UPDATE até o commit)."""
+    if _trava_escrita is None:
+        yield
+        return
+    async with _trava_escrita:
+        yield
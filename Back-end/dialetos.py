@@ -0,0 +1,78 @@
+from sqlalchemy import literal
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import String
+
+# ==================================
+#   SQL PORTÁTIL (MySQL / SQLite)
+# ==================================
+# Pedaços de SQL que cada banco escreve de um jeito. O SQLAlchemy
+# escolhe a versão certa na hora de compilar a consulta.
+
+
+class agregar_distintos(FunctionElement):
+    """
+    Junta os valores DISTINTOS do grupo em um texto, com um separador.
+    MySQL:  GROUP_CONCAT(DISTINCT x SEPARATOR '\\n')
+    SQLite: não aceita separador junto com DISTINCT, então os distintos vão
+            para um array JSON (json_group_array) e são juntos com o separador
+            em uma subconsulta. Chave Pix é texto livre e PODE ter vírgula.
+    Outros: string_agg(DISTINCT x, '\\n')
+    """
+    type = String()
+    inherit_cache = True
+    name = "agregar_distintos"
+
+    def __init__(self, expressao, separador: str):
+        super().__init__(expressao, literal(separador))
+
+
+def _argumentos(element, compiler, **kw):
+    expressao, separador = element.clauses.clauses
+    return (
+        compiler.process(expressao, **kw),
+        # O separador precisa ir como texto literal (o MySQL não aceita parâmetro ali)
+        compiler.process(separador, literal_binds=True, **kw),
+    )
+
+
+@compiles(agregar_distintos)
+def _agregar_distintos_padrao(element, compiler, **kw):
+    expressao, separador = _argumentos(element, compiler, **kw)
+    return f"string_agg(DISTINCT {expressao}, {separador})"
+
+
+@compiles(agregar_distintos, "mysql")
+def _agregar_distintos_mysql(element, compiler, **kw):
+    expressao, separador = _argumentos(element, compiler, **kw)
+    return f"GROUP_CONCAT(DISTINCT {expressao} SEPARATOR {separador})"
+
+
+@compiles(agregar_distintos, "sqlite")
+def _agregar_distintos_sqlite(element, compiler, **kw):
+    expressao, separador = _argumentos(element, compiler, **kw)
+    return (
+        f"(SELECT group_concat(value, {separador}) "
+        f"FROM json_each(json_group_array(DISTINCT {expressao})) "
+        f"WHERE value IS NOT NULL)"
+    )
+
+
+def inserir_ou_somar(dialeto: str, tabela, valores: dict, coluna: str):
+    """
+    INSERT que, se a chave primária já existir, SOMA 'valores[coluna]'
+    ao que está gravado (contadores). Cada banco tem sua sintaxe de "upsert".
+    """
+    if dialeto == "mysql":
+        statement = mysql.insert(tabela).values(**valores)
+        return statement.on_duplicate_key_update(
+            {coluna: tabela.c[coluna] + statement.inserted[coluna]}
+        )
+
+    insert = sqlite.insert if dialeto == "sqlite" else postgresql.insert
+    statement = insert(tabela).values(**valores)
+    return statement.on_conflict_do_update(
+        index_elements=list(tabela.primary_key.columns),
+        set_={coluna: tabela.c[coluna] + statement.excluded[coluna]},
+    )
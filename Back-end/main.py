@@ -1,18 +1,25 @@
 import os
+import asyncio
+import logging
 import bcrypt
 import auth
-from datetime import datetime, timedelta
-from typing import List, Annotated
+from datetime import datetime, timedelta, date
+from typing import List, Annotated, Literal, Union
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from pydantic import EmailStr, BaseModel
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Response
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Response, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from jose import JWTError, jwt
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Importando todos os nossos módulos locais
 import crud, models, schemas
-from database import get_db, engine, Base
+import arquivo
+import serializacao
+import sugestoes
+from database import get_db, engine, Base, AsyncSessionLocal
 from dotenv import load_dotenv
 # ==================================
 #         CONFIGURAÇÃO DE AUTH (JWT)
@@ -35,6 +42,12 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# De quanto em quanto tempo o índice das sugestões é recarregado do banco
+# (cada worker do uvicorn tem o seu; 0 desliga a recarga)
+SUGESTOES_RECARREGAR_MINUTOS = float(os.getenv("SUGESTOES_RECARREGAR_MINUTOS", 10))
+
+logger = logging.getLogger(__name__)
+
 
 # ==================================
 #         CRIAÇÃO DO APP
@@ -72,6 +85,45 @@ async def on_startup():
         # Cria as tabelas
         await conn.run_sync(Base.metadata.create_all)
 
+    # Carrega o índice em memória das sugestões (autocompletar)
+    await carregar_sugestoes()
+    if SUGESTOES_RECARREGAR_MINUTOS > 0:
+        app.state.recarga_sugestoes = asyncio.create_task(recarregar_sugestoes())
+
+    async with AsyncSessionLocal() as db:
+        # Primeira vez: preenche os contadores das facetas (depois, o
+        # create_denuncia mantém a conta a cada denúncia nova)
+        if not await crud.tem_contadores_facetas(db):
+            await crud.recontar_facetas(db)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    recarga = getattr(app.state, "recarga_sugestoes", None)
+    if recarga:
+        recarga.cancel()
+
+
+async def carregar_sugestoes():
+    """(Re)carrega do banco o índice das sugestões, campo a campo."""
+    async with AsyncSessionLocal() as db:
+        for campo in sugestoes.CAMPOS:
+            contagens = await crud.get_contagem_por_valor(db, campo)
+            await run_in_threadpool(sugestoes.indice.carregar, campo, contagens)
+
+
+async def recarregar_sugestoes():
+    """
+    Cada worker só soma no índice as denúncias que ele recebeu; recarregar
+    do banco traz as que chegaram pelos outros workers (e tira as arquivadas).
+    """
+    while True:
+        await asyncio.sleep(SUGESTOES_RECARREGAR_MINUTOS * 60)
+        try:
+            await carregar_sugestoes()
+        except Exception:
+            logger.exception("Falha ao recarregar o índice das sugestões")
+
 
 # ==================================
 #         FUNÇÕES DE AUTH
@@ -266,57 +318,151 @@ async def criar_denuncia(
     """
     anexo_bytes = await anexo.read()
 
-    db_denuncia = await crud.create_denuncia(
-        db=db,
-        anexo_bytes=anexo_bytes,
-        tipo_chave_pix=tipo_chave_pix,
-        chave_pix=chave_pix,
-        nome_conta=nome_conta,
-        numero_bo=numero_bo,
-        cpf_cnpj=cpf_cnpj,
-        banco=banco,
-        agencia=agencia,
-        conta=conta,
-        descricao=descricao
-        # Nota: 'valor' não está no nosso model/crud, então é ignorado.
+    # A mesma denúncia (chave + B.O. + arquivo) não pode entrar duas vezes
+    anexo_hash = crud.hash_anexo(anexo_bytes)
+    impressao = crud.impressao_denuncia(tipo_chave_pix, chave_pix, numero_bo, anexo_hash)
+    duplicata_exception = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Esta denúncia já foi registrada"
     )
-    return db_denuncia
+    if await crud.get_denuncia_id_by_impressao(db, impressao_digital=impressao):
+        raise duplicata_exception
+
+    try:
+        db_denuncia = await crud.create_denuncia(
+            db=db,
+            id_usuario=current_user.id_usuario,
+            anexo_bytes=anexo_bytes,
+            anexo_hash=anexo_hash,
+            impressao_digital=impressao,
+            tipo_chave_pix=tipo_chave_pix,
+            chave_pix=chave_pix,
+            nome_conta=nome_conta,
+            numero_bo=numero_bo,
+            cpf_cnpj=cpf_cnpj,
+            banco=banco,
+            agencia=agencia,
+            conta=conta,
+            descricao=descricao
+            # Nota: 'valor' não está no nosso model/crud, então é ignorado.
+        )
+    except IntegrityError as erro:
+        await db.rollback()
+        # Duas requisições iguais ao mesmo tempo: a chave de 'impressoes_denuncias'
+        # barrou a segunda. Qualquer outra violação é erro de verdade.
+        if not crud.violou_impressao_digital(erro):
+            raise
+        raise duplicata_exception
+
+    sugestoes.indice.adicionar_denuncia(db_denuncia)
+
+    return serializacao.json_denuncia(db_denuncia, status_code=status.HTTP_201_CREATED)
 
 
 # Esta é a rota de BUSCA (GET)
-@app.get("/api/denuncias", response_model=List[schemas.DenunciaAgrupada]) # <-- MUDANÇA (response_model)
+@app.get(
+    "/api/denuncias",
+    response_model=Union[List[schemas.DenunciaAgrupada], schemas.PesquisaComFacetas]
+)
 async def pesquisar_denuncias(
     q: str | None = None,
     tipo: str | None = None, 
+    modo: Literal["exato", "aproximado"] = "exato",
+    desde: date | None = None,
+    banco: str | None = None,
+    facetas: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: models.Usuario = Depends(auth.get_current_user)
 ):
     """
     Rota para a tela '#pesquisar' (MODO AGRUPADO).
     AGORA PROTEGIDA POR LOGIN.
+    Com modo=aproximado, 'q' é tratado como NOME da conta e aceita
+    variações de grafia ('Joao da Silva' acha 'João Silva').
+    Com 'desde' (AAAA-MM-DD), só lê as partições a partir dessa data.
+    Com facetas=true, devolve {resultados, facetas}: quantas denúncias da
+    pesquisa há por 'banco' e por 'tipo_chave_pix' (para os filtros da tela).
     """
+    data_minima = datetime.combine(desde, datetime.min.time()) if desde else None
+    aproximado = modo == "aproximado" and bool(q)
+
+    if facetas:
+        # Os grupos e as contagens saem da mesma passada pelas denúncias
+        resultados_tuplas, contagens = await crud.get_denuncias_e_facetas(
+            db, query=q, tipo=tipo, banco=banco, desde=data_minima, aproximado=aproximado
+        )
+        return serializacao.json_pesquisa_com_facetas(resultados_tuplas, contagens)
+
     # O CRUD agora retorna tuplas (linhas)
-    resultados_tuplas = await crud.get_denuncias_by_query(db, query=q, tipo=tipo)
+    if aproximado:
+        resultados_tuplas = await crud.get_denuncias_by_nome_aproximado(
+            db, nome=q, tipo=tipo, desde=data_minima, banco=banco
+        )
+    else:
+        resultados_tuplas = await crud.get_denuncias_by_query(
+            db, query=q, tipo=tipo, desde=data_minima, banco=banco
+        )
+
+    # As tuplas viram JSON direto (orjson), sem criar um DenunciaAgrupada
+    # por linha e sem a segunda validação do response_model.
+    return serializacao.json_denuncias_agrupadas(resultados_tuplas)
+
 
-    # Mapeia as tuplas para o nosso schema DenunciaAgrupada
-    denuncias_agrupadas = [
-        schemas.DenunciaAgrupada(
-            nome_conta=r.nome_conta,
-            cpf_cnpj=r.cpf_cnpj,
-            banco=r.banco,
-            chave_pix_exemplo=r.chave_pix_exemplo,
-            total_denuncias=r.total_denuncias
-        ) for r in resultados_tuplas
-    ]
+@app.get("/api/sugestoes", response_model=List[schemas.Sugestao])
+async def sugerir(
+    prefixo: Annotated[str, Query(min_length=1, max_length=100)],
+    campo: Literal["nome_conta", "chave_pix", "banco"] | None = None,
+    limite: Annotated[int, Query(ge=1, le=sugestoes.LIMITE_MAXIMO)] = 8,
+    current_user: models.Usuario = Depends(auth.get_current_user)
+):
+    """
+    Rota do autocompletar da tela '#pesquisar'.
+    Devolve os valores que começam com 'prefixo', os mais denunciados primeiro.
+    Vem do índice em memória: não consulta a tabela de denúncias.
+    """
+    return serializacao.resposta_json(sugestoes.indice.buscar(prefixo, campo, limite))
 
-    return denuncias_agrupadas
+
+@app.get("/api/denuncias/{denuncia_id}", response_model=schemas.Denuncia)
+async def detalhar_denuncia(
+    denuncia_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.Usuario = Depends(auth.get_current_user)
+):
+    """
+    Rota para ver os dados de UMA denúncia (sem o anexo).
+    Se ela já saiu do banco, procura no arquivo frio.
+    """
+    denuncia = await crud.get_denuncia_by_id(db, denuncia_id=denuncia_id)
+    if denuncia is None:
+        denuncia = await run_in_threadpool(arquivo.buscar_denuncia, denuncia_id)
+
+    if denuncia is None:
+        raise HTTPException(status_code=404, detail="Denúncia não encontrada")
+
+    return serializacao.json_denuncia(denuncia)
 
 @app.get("/api/denuncias/{denuncia_id}/anexo")
-async def baixar_anexo(denuncia_id: int, db: AsyncSession = Depends(get_db)):
+async def baixar_anexo(
+    denuncia_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.Usuario | None = Depends(auth.get_current_user_opcional)
+):
     """
     Rota para baixar o B.O. (anexo) de uma denúncia específica.
+    O arquivo frio (denúncias antigas) só é consultado com login.
     """
     anexo_bytes = await crud.get_denuncia_anexo_by_id(db, denuncia_id=denuncia_id)
+    if anexo_bytes is None:
+        if current_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Faça login para baixar anexos de denúncias arquivadas",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        # Denúncia antiga: o anexo está no arquivo frio
+        arquivada = await run_in_threadpool(arquivo.buscar_denuncia, denuncia_id)
+        anexo_bytes = arquivada.anexo if arquivada else None
     
     if not anexo_bytes:
         raise HTTPException(status_code=404, detail="Anexo não encontrado")
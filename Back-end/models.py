@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, LargeBinary
+from sqlalchemy import Column, Integer, String, DateTime, func, LargeBinary, Index
 from database import Base
 import datetime
 # Este 'Base' é o que estava com a linha amarela. 
@@ -45,5 +45,63 @@ class Denuncia(Base):
     conta = Column(String(20), nullable=True)
     descricao = Column(String(255), nullable=True)
 
+    # --- Quem denunciou (nulo nas denúncias antigas) ---
+    id_usuario = Column(Integer, nullable=True, index=True)
+
+    # --- Anti-duplicata ---
+    # SHA-256 do arquivo do B.O. e a "impressão digital" da denúncia
+    # (chave canônica + B.O. + hash do anexo). A unicidade fica na tabela
+    # 'impressoes_denuncias': tabela particionada não aceita índice único
+    # que não inclua a coluna da partição.
+    anexo_hash = Column(String(64), nullable=True)
+    impressao_digital = Column(String(64), nullable=True, index=True)
+
     # --- Campo Automático ---
-    data_denuncia = Column(DateTime, default=datetime.datetime.utcnow)
\ No newline at end of file
+    # É a coluna de particionamento mensal (veja particoes.py)
+    data_denuncia = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+    # Filtros e recontagem das facetas (por tipo de chave e por banco)
+    __table_args__ = (Index("idx_tipo_banco", "tipo_chave_pix", "banco"),)
+
+
+class DenunciaChaveNome(Base):
+    """
+    Chaves de bloqueio (fonéticas) do 'nome_conta' de cada denúncia.
+    Geradas na gravação (veja busca_nomes.py) e usadas pela busca aproximada.
+    """
+    __tablename__ = "denuncias_chaves_nome"
+
+    id = Column(Integer, primary_key=True)
+    id_denuncia = Column(Integer, nullable=False, index=True)
+    # Copiado da denúncia: a busca escolhe GRUPOS, sem ler a tabela 'denuncias'
+    grupo_fraude_id = Column(String(255), nullable=False)
+    chave = Column(String(40), nullable=False)
+
+    # A busca filtra pela chave e só precisa do grupo (e do id, para desempate):
+    # índice "cobrindo" os três
+    __table_args__ = (Index("idx_chave_grupo", "chave", "grupo_fraude_id", "id_denuncia"),)
+
+
+class ImpressaoDenuncia(Base):
+    """
+    Registro das impressões digitais já usadas (uma por denúncia).
+    Fica fora da tabela particionada e continua valendo para as
+    denúncias arquivadas, então uma denúncia antiga não pode ser reenviada.
+    """
+    __tablename__ = "impressoes_denuncias"
+
+    impressao_digital = Column(String(64), primary_key=True)
+    id_denuncia = Column(Integer, nullable=False)
+
+
+class ContagemDenuncias(Base):
+    """
+    Quantas denúncias existem para cada par (tipo de chave, banco).
+    Mantida a cada denúncia nova; serve as facetas da pesquisa sem
+    precisar de um GROUP BY na tabela 'denuncias'.
+    """
+    __tablename__ = "contagens_denuncias"
+
+    tipo_chave_pix = Column(String(15), primary_key=True)
+    banco = Column(String(100), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,84 @@
+from datetime import date, datetime
+
+# ==================================
+#   PARTICIONAMENTO MENSAL (MySQL)
+# ==================================
+# A tabela 'denuncias' é particionada por mês em 'data_denuncia'
+# (RANGE COLUMNS). Cada mês vira a partição 'pAAAAMM' e a 'pmax'
+# recebe o que ainda não tem partição própria. Assim:
+#   - buscas com data mínima só leem os meses recentes (poda);
+#   - arquivar um mês antigo é um DROP PARTITION, sem DELETE linha a linha.
+
+PARTICAO_MAXIMA = "pmax"
+
+
+def inicio_do_mes(data: date | datetime) -> date:
+    return date(data.year, data.month, 1)
+
+
+def somar_meses(mes: date, meses: int) -> date:
+    """Primeiro dia do mês 'meses' depois (ou antes, se negativo) de 'mes'."""
+    total = mes.year * 12 + (mes.month - 1) + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def meses_entre(inicio: date, fim: date) -> list[date]:
+    """Primeiros dias de cada mês de 'inicio' até 'fim' (inclusive)."""
+    meses = []
+    mes = inicio_do_mes(inicio)
+    while mes <= fim:
+        meses.append(mes)
+        mes = somar_meses(mes, 1)
+    return meses
+
+
+def nome_particao(mes: date) -> str:
+    return f"p{mes.year:04d}{mes.month:02d}"
+
+
+def mes_da_particao(nome: str) -> date | None:
+    """'p202401' -> date(2024, 1, 1). Retorna None para a 'pmax'."""
+    if nome == PARTICAO_MAXIMA:
+        return None
+    return date(int(nome[1:5]), int(nome[5:7]), 1)
+
+
+def _definicao(mes: date) -> str:
+    limite = somar_meses(mes, 1).isoformat()
+    return f"PARTITION {nome_particao(mes)} VALUES LESS THAN ('{limite}')"
+
+
+def _definicao_maxima() -> str:
+    return f"PARTITION {PARTICAO_MAXIMA} VALUES LESS THAN (MAXVALUE)"
+
+
+def sql_particionar(meses: list[date]) -> str:
+    """ALTER que particiona a tabela (primeira vez) com uma partição por mês."""
+    definicoes = [_definicao(mes) for mes in meses] + [_definicao_maxima()]
+    return (
+        "ALTER TABLE denuncias PARTITION BY RANGE COLUMNS(data_denuncia) (\n    "
+        + ",\n    ".join(definicoes)
+        + "\n)"
+    )
+
+
+def sql_novas_particoes(meses: list[date]) -> str:
+    """ALTER que "quebra" a 'pmax' para criar as partições dos próximos meses."""
+    definicoes = [_definicao(mes) for mes in meses] + [_definicao_maxima()]
+    return (
+        f"ALTER TABLE denuncias REORGANIZE PARTITION {PARTICAO_MAXIMA} INTO (\n    "
+        + ",\n    ".join(definicoes)
+        + "\n)"
+    )
+
+
+def sql_remover_particao(mes: date) -> str:
+    return f"ALTER TABLE denuncias DROP PARTITION {nome_particao(mes)}"
+
+
+# Partições existentes (a coluna PARTITION_NAME é NULL se não há particionamento)
+SQL_LISTAR_PARTICOES = (
+    "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'denuncias' "
+    "AND PARTITION_NAME IS NOT NULL"
+)
@@ -112,11 +112,38 @@ class DenunciaAgrupada(BaseModel):
     cpf_cnpj: str
     banco: str
 
-    # Um exemplo de chave pix usada nesse grupo
-    chave_pix_exemplo: str 
+    # As chaves pix usadas nesse grupo, uma por linha.
+    # None quando o grupo só tem "Chave aleatória" (elas não são listadas)
+    chave_pix_exemplo: Optional[str] = None
 
     # A contagem total
     total_denuncias: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class Sugestao(BaseModel):
+    """
+    Schema para SAÍDA (autocompletar da Pesquisa).
+    Um valor que começa com o que foi digitado.
+    """
+    campo: str  # 'nome_conta', 'chave_pix' ou 'banco'
+    valor: str
+    total_denuncias: int
+
+class Faceta(BaseModel):
+    """Um valor do filtro e quantas denúncias da pesquisa têm esse valor."""
+    valor: str
+    total: int
+
+class Facetas(BaseModel):
+    banco: list[Faceta]
+    tipo_chave_pix: list[Faceta]
+
+class PesquisaComFacetas(BaseModel):
+    """
+    Schema para SAÍDA (Pesquisa com facetas=true).
+    Os grupos de sempre, mais as contagens por banco e por tipo de chave.
+    """
+    resultados: list[DenunciaAgrupada]
+    facetas: Facetas
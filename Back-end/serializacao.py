@@ -0,0 +1,54 @@
+import orjson
+from fastapi import Response
+
+import schemas
+
+# ==================================
+#     SERIALIZAÇÃO RÁPIDA (orjson)
+# ==================================
+# Quando a rota devolve um 'Response' pronto, o FastAPI NÃO valida nem
+# serializa de novo pelo 'response_model' (que continua valendo só para
+# a documentação/OpenAPI). Aqui transformamos as linhas do banco direto
+# em bytes JSON com o orjson, sem criar objetos Pydantic no caminho.
+
+# Os campos publicados saem dos próprios schemas, para não desalinhar
+CAMPOS_DENUNCIA = tuple(schemas.Denuncia.model_fields)
+CAMPOS_DENUNCIA_AGRUPADA = tuple(schemas.DenunciaAgrupada.model_fields)
+
+
+def resposta_json(conteudo, status_code: int = 200) -> Response:
+    """Resposta JSON codificada com orjson (datetime já sai em ISO 8601)."""
+    return Response(
+        content=orjson.dumps(conteudo),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def linhas_para_dicts(linhas, campos: tuple[str, ...]) -> list[dict]:
+    """Converte linhas do SQLAlchemy (Row) em dicts só com os campos publicados."""
+    return [{campo: getattr(linha, campo) for campo in campos} for linha in linhas]
+
+
+def json_denuncias_agrupadas(linhas) -> Response:
+    """Resposta da pesquisa (lista de schemas.DenunciaAgrupada)."""
+    return resposta_json(linhas_para_dicts(linhas, CAMPOS_DENUNCIA_AGRUPADA))
+
+
+def json_denuncia(denuncia, status_code: int = 200) -> Response:
+    """Resposta de UMA denúncia (schemas.Denuncia), vinda do ORM ou de uma Row."""
+    return resposta_json(
+        {campo: getattr(denuncia, campo) for campo in CAMPOS_DENUNCIA},
+        status_code=status_code,
+    )
+
+
+def json_pesquisa_com_facetas(linhas, facetas: dict[str, list[tuple]]) -> Response:
+    """Resposta da pesquisa com facetas (schemas.PesquisaComFacetas)."""
+    return resposta_json({
+        "resultados": linhas_para_dicts(linhas, CAMPOS_DENUNCIA_AGRUPADA),
+        "facetas": {
+            nome: [{"valor": valor, "total": total} for valor, total in contagens]
+            for nome, contagens in facetas.items()
+        },
+    })
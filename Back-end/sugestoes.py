@@ -0,0 +1,153 @@
+import heapq
+from bisect import bisect_left, insort
+
+import busca_nomes
+
+# ==================================
+#   SUGESTÕES (AUTOCOMPLETAR)
+# ==================================
+# Índice em memória, por campo, para sugerir valores enquanto o usuário
+# digita. Cada campo guarda uma LISTA ORDENADA dos valores normalizados:
+# os valores que começam com um prefixo formam uma faixa contínua da
+# lista, achada com busca binária. Os mais denunciados da faixa são a
+# resposta.
+#
+# Faixas grandes (prefixos curtos, como "ma") têm o top-k guardado em
+# cache. Como as contagens só sobem enquanto a API roda, o cache é
+# atualizado a cada denúncia nova sem perder a exatidão.
+#
+# O índice é de CADA processo: com 'uvicorn --workers N', um worker só
+# soma as denúncias que ele mesmo recebeu. Por isso a API recarrega o
+# índice do banco de tempos em tempos (SUGESTOES_RECARREGAR_MINUTOS).
+
+CAMPOS = ("nome_conta", "chave_pix", "banco")
+
+# Quantas sugestões guardamos por prefixo (e o máximo que a rota devolve)
+LIMITE_MAXIMO = 20
+
+# Faixas com mais valores que isso têm o resultado guardado em cache
+FAIXA_PARA_CACHE = 2000
+
+# Prefixos até esse tamanho já saem calculados ao carregar o índice
+PREFIXO_AQUECIDO = 3
+
+# Depois do último caractere possível: fecha a faixa do prefixo
+_FIM = "\U0010ffff"
+
+
+def normalizar(valor: str) -> str:
+    """Sem acento, minúsculo e sem espaços nas pontas."""
+    return busca_nomes.remover_acentos(valor).lower().strip()
+
+
+class IndicePrefixos:
+    """Índice de prefixos de UM campo (ex.: todos os 'nome_conta')."""
+
+    def __init__(self):
+        self._valores: list[str] = []           # normalizados, em ordem
+        self._dados: dict[str, list] = {}       # normalizado -> [original, total]
+        self._cache: dict[str, list[str]] = {}  # prefixo -> top normalizados
+
+    def __len__(self):
+        return len(self._valores)
+
+    def carregar(self, contagens):
+        """(Re)constrói o índice a partir de pares (valor, total de denúncias)."""
+        dados = {}
+        for valor, total in contagens:
+            if not valor:
+                continue
+            chave = normalizar(valor)
+            if chave in dados:
+                dados[chave][1] += total
+            else:
+                dados[chave] = [valor, total]
+
+        self._dados = dados
+        self._valores = sorted(dados)
+        self._cache = {}
+
+        prefixos = {chave[:tamanho] for chave in self._valores for tamanho in range(1, PREFIXO_AQUECIDO + 1)}
+        for prefixo in prefixos:
+            self._top(prefixo)
+
+    def adicionar(self, valor: str, quantidade: int = 1):
+        """Conta mais 'quantidade' denúncias para o valor (novo ou não)."""
+        if not valor:
+            return
+        chave = normalizar(valor)
+        if chave in self._dados:
+            self._dados[chave][1] += quantidade
+        else:
+            self._dados[chave] = [valor, quantidade]
+            insort(self._valores, chave)
+
+        total = self._dados[chave][1]
+        for tamanho in range(1, len(chave) + 1):
+            top = self._cache.get(chave[:tamanho])
+            if top is None:
+                continue
+            if chave in top:
+                top.sort(key=self._total, reverse=True)
+            elif len(top) < LIMITE_MAXIMO or total > self._total(top[-1]):
+                top.append(chave)
+                top.sort(key=self._total, reverse=True)
+                del top[LIMITE_MAXIMO:]
+
+    def buscar(self, prefixo: str, limite: int) -> list[tuple[str, int]]:
+        """Os 'limite' valores mais denunciados que começam com 'prefixo'."""
+        prefixo = normalizar(prefixo)
+        if not prefixo:
+            return []
+        top = self._top(prefixo)
+        return [tuple(self._dados[chave]) for chave in top[:limite]]
+
+    def _total(self, chave: str) -> int:
+        return self._dados[chave][1]
+
+    def _top(self, prefixo: str) -> list[str]:
+        if prefixo in self._cache:
+            return self._cache[prefixo]
+
+        inicio = bisect_left(self._valores, prefixo)
+        fim = bisect_left(self._valores, prefixo + _FIM, inicio)
+        top = heapq.nlargest(LIMITE_MAXIMO, self._valores[inicio:fim], key=self._total)
+        if fim - inicio > FAIXA_PARA_CACHE or len(prefixo) <= PREFIXO_AQUECIDO:
+            self._cache[prefixo] = top
+        return top
+
+
+class IndiceSugestoes:
+    """Um IndicePrefixos para cada campo sugerido."""
+
+    def __init__(self):
+        self.campos = {campo: IndicePrefixos() for campo in CAMPOS}
+
+    def carregar(self, campo: str, contagens):
+        """
+        Monta um índice NOVO para o campo e só então troca o antigo,
+        para as buscas em andamento nunca verem um índice pela metade.
+        """
+        novo = IndicePrefixos()
+        novo.carregar(contagens)
+        self.campos[campo] = novo
+
+    def adicionar_denuncia(self, denuncia):
+        """Atualiza os campos com uma denúncia recém-criada."""
+        for campo, indice in list(self.campos.items()):
+            indice.adicionar(getattr(denuncia, campo))
+
+    def buscar(self, prefixo: str, campo: str | None, limite: int) -> list[dict]:
+        """Sugestões de um campo, ou de todos juntos (os mais denunciados primeiro)."""
+        campos = [campo] if campo else list(self.campos)
+        sugestoes = [
+            {"campo": nome, "valor": valor, "total_denuncias": total}
+            for nome in campos
+            for valor, total in self.campos[nome].buscar(prefixo, limite)
+        ]
+        sugestoes.sort(key=lambda s: s["total_denuncias"], reverse=True)
+        return sugestoes[:limite]
+
+
+# Índice único do processo: carregado no startup da API (main.py)
+indice = IndiceSugestoes()
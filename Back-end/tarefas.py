@@ -0,0 +1,266 @@
+"""
+Tarefas de manutenção do banco, rodadas pela linha de comando
+(com o venv ativo, dentro da pasta Back-end):
+
+    python tarefas.py backfill-nomes
+    python tarefas.py colapsar-duplicadas
+    python tarefas.py particionar             (uma vez, só MySQL)
+    python tarefas.py criar-particoes         (todo mês)
+    python tarefas.py arquivar --retencao-meses 24
+    python tarefas.py recontar-facetas
+"""
+import argparse
+import asyncio
+from datetime import datetime, time
+
+from sqlalchemy import text
+
+import arquivo
+import crud
+import particoes
+from database import AsyncSessionLocal, engine, Base
+
+
+async def _criar_tabelas():
+    """Garante que as tabelas novas (chaves de nome, impressões...) existam."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def _como_datetime(mes) -> datetime:
+    return datetime.combine(mes, time())
+
+
+async def _particoes_existentes(conn) -> set[str]:
+    if engine.dialect.name != "mysql":
+        return set()
+    result = await conn.execute(text(particoes.SQL_LISTAR_PARTICOES))
+    return set(result.scalars().all())
+
+
+async def backfill_nomes(lote: int):
+    """Gera as chaves da busca aproximada para as denúncias já existentes."""
+    await _criar_tabelas()
+
+    ultimo_id = 0
+    total = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            proximo = await crud.backfill_chaves_nome(db, ultimo_id=ultimo_id, lote=lote)
+            if proximo is None:
+                break
+            total += 1
+            ultimo_id = proximo
+            print(f"Lote {total} processado (até id {ultimo_id})")
+
+    await engine.dispose()
+    print("Backfill das chaves de nome concluído.")
+
+
+async def colapsar_duplicadas(lote: int):
+    """Apaga as denúncias repetidas já gravadas e preenche a impressão digital."""
+    await _criar_tabelas()
+
+    ultimo_id = 0
+    apagadas = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            proximo, removidas = await crud.colapsar_duplicadas_lote(db, ultimo_id=ultimo_id, lote=lote)
+            if proximo is None:
+                break
+            apagadas += removidas
+            ultimo_id = proximo
+            print(f"Processado até id {ultimo_id} ({apagadas} duplicadas apagadas)")
+        if apagadas:
+            await crud.recontar_facetas(db)
+
+    await engine.dispose()
+    print(f"Limpeza concluída: {apagadas} denúncias duplicadas apagadas.")
+
+
+async def particionar(meses_futuros: int):
+    """
+    Migração (uma vez) da tabela 'denuncias' para partições mensais.
+    O MySQL exige que TODA chave única inclua a coluna da partição, então:
+    a unicidade da impressão digital vai para 'impressoes_denuncias' e a
+    chave primária passa a ser (id_denuncia, data_denuncia).
+    """
+    if engine.dialect.name != "mysql":
+        print("Particionamento só existe no MySQL; nada a fazer.")
+        return
+
+    await _criar_tabelas()
+
+    async with engine.begin() as conn:
+        if await _particoes_existentes(conn):
+            print("A tabela 'denuncias' já está particionada. Use 'criar-particoes'.")
+            return
+
+        print("1/4 Copiando as impressões digitais para 'impressoes_denuncias'...")
+        await conn.execute(text(
+            "INSERT IGNORE INTO impressoes_denuncias (impressao_digital, id_denuncia) "
+            "SELECT impressao_digital, MIN(id_denuncia) FROM denuncias "
+            "WHERE impressao_digital IS NOT NULL GROUP BY impressao_digital"
+        ))
+        indices = (await conn.execute(text(
+            "SELECT DISTINCT INDEX_NAME, NON_UNIQUE FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'denuncias' "
+            "AND COLUMN_NAME = 'impressao_digital'"
+        ))).all()
+        for nome_indice, nao_unico in indices:
+            if not nao_unico:
+                await conn.execute(text(f"ALTER TABLE denuncias DROP INDEX `{nome_indice}`"))
+        if not any(nao_unico for _, nao_unico in indices):
+            await conn.execute(text(
+                "CREATE INDEX ix_denuncias_impressao_digital ON denuncias (impressao_digital)"
+            ))
+
+        print("2/4 Preenchendo datas vazias e tornando 'data_denuncia' obrigatória...")
+        await conn.execute(text(
+            "UPDATE denuncias SET data_denuncia = CURRENT_TIMESTAMP WHERE data_denuncia IS NULL"
+        ))
+        await conn.execute(text(
+            "ALTER TABLE denuncias MODIFY data_denuncia DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ))
+
+        print("3/4 Trocando a chave primária para (id_denuncia, data_denuncia)...")
+        await conn.execute(text(
+            "ALTER TABLE denuncias DROP PRIMARY KEY, ADD PRIMARY KEY (id_denuncia, data_denuncia)"
+        ))
+
+        mais_antiga = (await conn.execute(text("SELECT MIN(data_denuncia) FROM denuncias"))).scalar()
+        este_mes = particoes.inicio_do_mes(datetime.utcnow())
+        meses = particoes.meses_entre(
+            mais_antiga or este_mes, particoes.somar_meses(este_mes, meses_futuros)
+        )
+        print(f"4/4 Criando {len(meses)} partições mensais (pode demorar: a tabela é reescrita)...")
+        await conn.execute(text(particoes.sql_particionar(meses)))
+
+    await engine.dispose()
+    print("Particionamento concluído.")
+
+
+async def criar_particoes(meses_futuros: int):
+    """Cria as partições dos próximos meses (rodar todo mês, antes da virada)."""
+    async with engine.begin() as conn:
+        existentes = await _particoes_existentes(conn)
+        meses_existentes = [m for m in map(particoes.mes_da_particao, existentes) if m]
+        if not meses_existentes:
+            print("A tabela 'denuncias' não está particionada. Rode 'particionar' antes.")
+            return
+
+        proximo = particoes.somar_meses(max(meses_existentes), 1)
+        ate = particoes.somar_meses(particoes.inicio_do_mes(datetime.utcnow()), meses_futuros)
+        novos = particoes.meses_entre(proximo, ate) if proximo <= ate else []
+        if novos:
+            await conn.execute(text(particoes.sql_novas_particoes(novos)))
+
+    await engine.dispose()
+    print(f"{len(novos)} partição(ões) criada(s).")
+
+
+async def arquivar(retencao_meses: int, lote: int):
+    """
+    Move para o arquivo frio (arquivo.py) os meses mais antigos que o prazo
+    de retenção. Cada mês é copiado inteiro para o arquivo e SÓ DEPOIS sai do
+    banco: com DROP PARTITION se a tabela for particionada, senão com DELETE.
+    """
+    horizonte = particoes.somar_meses(
+        particoes.inicio_do_mes(datetime.utcnow()), -retencao_meses
+    )
+
+    async with AsyncSessionLocal() as db:
+        mais_antiga = await crud.get_data_denuncia_mais_antiga(db)
+        existentes = await _particoes_existentes(await db.connection())
+        await db.commit()
+
+        if mais_antiga is None or mais_antiga >= _como_datetime(horizonte):
+            print("Nenhum mês para arquivar.")
+            await engine.dispose()
+            return
+
+        for mes in particoes.meses_entre(mais_antiga, particoes.somar_meses(horizonte, -1)):
+            inicio, fim = _como_datetime(mes), _como_datetime(particoes.somar_meses(mes, 1))
+            gravador = None
+            ids = []
+            while True:
+                linhas = await crud.get_denuncias_do_periodo_lote(
+                    db, inicio=inicio, fim=fim, ultimo_id=ids[-1] if ids else 0, lote=lote
+                )
+                if not linhas:
+                    break
+                gravador = gravador or arquivo.GravadorMes(mes)
+                for linha in linhas:
+                    gravador.escrever(linha)
+                    ids.append(linha["id_denuncia"])
+                # Não segura a transação (nem os anexos) entre os lotes
+                await db.commit()
+
+            if gravador:
+                gravador.concluir()
+
+            derrubar_particao = particoes.nome_particao(mes) in existentes
+            await crud.remover_denuncias_arquivadas(db, ids, apagar_denuncias=not derrubar_particao)
+            if derrubar_particao:
+                await db.execute(text(particoes.sql_remover_particao(mes)))
+                await db.commit()
+
+            if ids or derrubar_particao:
+                print(f"{mes:%Y-%m}: {len(ids)} denúncias arquivadas")
+
+        # Os contadores das facetas contavam as denúncias que saíram
+        await crud.recontar_facetas(db)
+
+    await engine.dispose()
+    print("Arquivamento concluído.")
+
+
+async def recontar_facetas():
+    """Refaz os contadores das facetas (banco / tipo de chave) do zero."""
+    await _criar_tabelas()
+    async with AsyncSessionLocal() as db:
+        await crud.recontar_facetas(db)
+    await engine.dispose()
+    print("Contadores das facetas recalculados.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tarefas de manutenção do De Olho no Pix")
+    sub = parser.add_subparsers(dest="tarefa", required=True)
+
+    p_nomes = sub.add_parser("backfill-nomes", help="Gera as chaves de busca por nome das denúncias antigas")
+    p_nomes.add_argument("--lote", type=int, default=1000, help="Denúncias por transação")
+
+    p_dup = sub.add_parser("colapsar-duplicadas", help="Apaga denúncias repetidas (mesma chave, B.O. e anexo)")
+    p_dup.add_argument("--lote", type=int, default=100, help="Denúncias por transação (cada uma pode trazer o anexo)")
+
+    p_part = sub.add_parser("particionar", help="Particiona a tabela 'denuncias' por mês (MySQL, uma vez)")
+    p_part.add_argument("--meses-futuros", type=int, default=3, help="Partições criadas além do mês atual")
+
+    p_novas = sub.add_parser("criar-particoes", help="Cria as partições dos próximos meses")
+    p_novas.add_argument("--meses-futuros", type=int, default=3)
+
+    p_arq = sub.add_parser("arquivar", help="Move os meses antigos para o arquivo frio compactado")
+    p_arq.add_argument("--retencao-meses", type=int, default=24, help="Meses que ficam no banco")
+    p_arq.add_argument("--lote", type=int, default=100, help="Denúncias lidas por vez (com anexo)")
+
+    sub.add_parser("recontar-facetas", help="Recalcula as contagens por banco e tipo de chave")
+
+    args = parser.parse_args()
+
+    if args.tarefa == "backfill-nomes":
+        asyncio.run(backfill_nomes(args.lote))
+    elif args.tarefa == "colapsar-duplicadas":
+        asyncio.run(colapsar_duplicadas(args.lote))
+    elif args.tarefa == "particionar":
+        asyncio.run(particionar(args.meses_futuros))
+    elif args.tarefa == "criar-particoes":
+        asyncio.run(criar_particoes(args.meses_futuros))
+    elif args.tarefa == "arquivar":
+        asyncio.run(arquivar(args.retencao_meses, args.lote))
+    elif args.tarefa == "recontar-facetas":
+        asyncio.run(recontar_facetas())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from conftest import palavra_unica
+
+
+def _pesquisar(cliente, cabecalhos, **parametros):
+    resposta = cliente.get("/api/denuncias", params=parametros, headers=cabecalhos)
+    assert resposta.status_code == 200, resposta.text
+    return resposta.json()
+
+
+def _faceta(facetas, nome) -> dict:
+    return {item["valor"]: item["total"] for item in facetas[nome]}
+
+
+# ==================================
+#         USUÁRIOS E LOGIN
+# ==================================
+
+def test_login_e_perfil(cliente, cabecalhos):
+    resposta = cliente.get("/api/me", headers=cabecalhos)
+    assert resposta.status_code == 200
+    assert resposta.json()["nome"] == "Teste"
+
+
+def test_login_com_senha_errada(cliente, cabecalhos):
+    email = cliente.get("/api/me", headers=cabecalhos).json()["email"]
+    resposta = cliente.post("/api/login", json={"email": email, "senha": "errada"})
+    assert resposta.status_code == 401
+
+
+def test_rotas_exigem_login(cliente):
+    assert cliente.get("/api/denuncias").status_code == 401
+    assert cliente.get("/api/sugestoes", params={"prefixo": "a"}).status_code == 401
+
+
+# ==================================
+#       CRIAÇÃO E DETALHE
+# ==================================
+
+def test_criar_e_detalhar_denuncia(cliente, cabecalhos, denunciar):
+    nome = f"Fulano {palavra_unica()}"
+    resposta = denunciar(anexo=b"%PDF-conteudo", nome_conta=nome)
+    assert resposta.status_code == 201, resposta.text
+    criada = resposta.json()
+    assert criada["nome_conta"] == nome
+    assert "anexo" not in criada
+
+    detalhe = cliente.get(f"/api/denuncias/{criada['id_denuncia']}", headers=cabecalhos)
+    assert detalhe.status_code == 200
+    assert detalhe.json() == criada
+
+    anexo = cliente.get(f"/api/denuncias/{criada['id_denuncia']}/anexo", headers=cabecalhos)
+    assert anexo.status_code == 200
+    assert anexo.content == b"%PDF-conteudo"
+
+
+def test_denuncia_inexistente(cliente, cabecalhos):
+    assert cliente.get("/api/denuncias/999999999", headers=cabecalhos).status_code == 404
+
+
+def test_denuncia_repetida(denunciar):
+    campos = {"chave_pix": palavra_unica(11), "numero_bo": palavra_unica()}
+    assert denunciar(anexo=b"mesmo arquivo", **campos).status_code == 201
+
+    repetida = denunciar(anexo=b"mesmo arquivo", **campos)
+    assert repetida.status_code == 409
+
+    # Outro arquivo de B.O. é outra denúncia
+    assert denunciar(anexo=b"outro arquivo", **campos).status_code == 201
+
+
+def test_denuncia_repetida_ao_mesmo_tempo(denunciar, monkeypatch):
+    import crud
+
+    campos = {"chave_pix": palavra_unica(11), "numero_bo": palavra_unica()}
+    assert denunciar(anexo=b"mesmo arquivo", **campos).status_code == 201
+
+    # A segunda requisição passa pela consulta antes da primeira gravar:
+    # quem barra é a chave primária de 'impressoes_denuncias'
+    async def ainda_nao_gravada(db, impressao_digital):
+        return None
+    monkeypatch.setattr(crud, "get_denuncia_id_by_impressao", ainda_nao_gravada)
+    assert denunciar(anexo=b"mesmo arquivo", **campos).status_code == 409
+
+
+def test_outras_violacoes_nao_viram_409(denunciar, monkeypatch):
+    import crud
+
+    async def falha_de_integridade(**kwargs):
+        raise IntegrityError(
+            "INSERT INTO denuncias ...", {}, Exception("NOT NULL constraint failed: denuncias.nome_conta")
+        )
+    monkeypatch.setattr(crud, "create_denuncia", falha_de_integridade)
+    with pytest.raises(IntegrityError):
+        denunciar()
+
+
+@pytest.mark.parametrize("original, repetida", [
+    # MySQL 8.0.19+
+    (Exception(1062, "Duplicate entry 'abc' for key 'impressoes_denuncias.PRIMARY'"), True),
+    # MySQL antigo e MariaDB: sem o nome da tabela
+    (Exception(1062, "Duplicate entry 'abc' for key 'PRIMARY'"), True),
+    (Exception(1048, "Column 'nome_conta' cannot be null"), False),
+    (Exception("NOT NULL constraint failed: denuncias.nome_conta"), False),
+])
+def test_violou_impressao_digital_pelo_codigo(original, repetida):
+    import crud
+
+    assert crud.violou_impressao_digital(IntegrityError("INSERT ...", {}, original)) is repetida
+
+
+# ==================================
+#             PESQUISA
+# ==================================
+
+def test_pesquisa_exata(cliente, cabecalhos, denunciar):
+    nome = f"Fulano {palavra_unica()}"
+    chave = palavra_unica(11)
+    assert denunciar(nome_conta=nome, chave_pix=chave, tipo_chave_pix="E-mail").status_code == 201
+
+    resultados = _pesquisar(cliente, cabecalhos, q=nome)
+    assert [r["nome_conta"] for r in resultados] == [nome]
+    assert resultados[0]["chave_pix_exemplo"] == chave
+    assert resultados[0]["total_denuncias"] == 1
+
+    assert _pesquisar(cliente, cabecalhos, q=nome, tipo="CPF") == []
+
+
+def test_chaves_com_virgula(cliente, cabecalhos, denunciar):
+    nome = f"Fulano {palavra_unica()}"
+    chaves = {f"{palavra_unica()},{palavra_unica()}@example.com", palavra_unica(11)}
+    for chave in chaves:
+        assert denunciar(nome_conta=nome, chave_pix=chave, tipo_chave_pix="E-mail").status_code == 201
+
+    for parametros in ({"q": nome}, {"q": nome, "facetas": "true"}):
+        resposta = _pesquisar(cliente, cabecalhos, **parametros)
+        resultados = resposta["resultados"] if "facetas" in parametros else resposta
+        assert set(resultados[0]["chave_pix_exemplo"].split("\n")) == chaves, parametros
+
+
+def test_grupo_so_com_chaves_aleatorias(cliente, cabecalhos, denunciar):
+    import schemas
+
+    nome = f"Fulano {palavra_unica()}"
+    assert denunciar(nome_conta=nome, tipo_chave_pix="Chave aleatória").status_code == 201
+
+    resultados = _pesquisar(cliente, cabecalhos, q=nome)
+    assert resultados[0]["chave_pix_exemplo"] is None
+    # A resposta (montada sem o response_model) bate com o schema publicado
+    schemas.DenunciaAgrupada.model_validate(resultados[0])
+
+
+def test_pesquisa_aproximada(cliente, cabecalhos, denunciar):
+    sobrenome = palavra_unica()
+    nome = f"João Gonçalves {sobrenome}"
+    assert denunciar(nome_conta=nome).status_code == 201
+
+    for busca in (f"Joao Goncalves {sobrenome}", f"Joao da Gonsalves {sobrenome}"):
+        resultados = _pesquisar(cliente, cabecalhos, q=busca, modo="aproximado")
+        assert nome in [r["nome_conta"] for r in resultados], busca
+
+
+def test_pesquisa_aproximada_filtra_antes_do_limite(cliente, cabecalhos, denunciar, monkeypatch):
+    import crud
+
+    sobrenome = palavra_unica()
+    banco = f"Banco {palavra_unica()}"
+    assert denunciar(nome_conta=f"Maria {sobrenome}", tipo_chave_pix="CPF", banco=banco).status_code == 201
+    for cpf_cnpj in ("11111111111", "22222222222", "33333333333"):
+        assert denunciar(
+            nome_conta=f"Maria {sobrenome}", tipo_chave_pix="Telefone", cpf_cnpj=cpf_cnpj
+        ).status_code == 201
+
+    # Os grupos candidatos mais recentes são de outro tipo e banco
+    monkeypatch.setattr(crud, "LIMITE_CANDIDATOS_NOME", 2)
+    for filtro in ({"tipo": "CPF"}, {"banco": banco}):
+        resultados = _pesquisar(cliente, cabecalhos, q=f"Maria {sobrenome}", modo="aproximado", **filtro)
+        assert sum(r["total_denuncias"] for r in resultados) == 1, filtro
+
+
+def test_pesquisa_aproximada_conta_o_grupo_inteiro(cliente, cabecalhos, denunciar, monkeypatch):
+    import crud
+
+    sobrenome = palavra_unica()
+    nome = f"Maria {sobrenome}"
+    antigo = denunciar(nome_conta=nome, cpf_cnpj="99999999999", tipo_chave_pix="E-mail")
+    assert antigo.status_code == 201
+    chaves = [palavra_unica(11) for _ in range(3)]
+    for chave in chaves:
+        assert denunciar(nome_conta=nome, chave_pix=chave).status_code == 201
+
+    # Um grupo com mais denúncias que o limite de candidatos
+    monkeypatch.setattr(crud, "LIMITE_CANDIDATOS_NOME", 2)
+    exata = _pesquisar(cliente, cabecalhos, q=nome)
+    aproximada = _pesquisar(cliente, cabecalhos, q=f"Maria {sobrenome}", modo="aproximado")
+    assert sorted(map(str, aproximada)) == sorted(map(str, exata))
+    totais = {r["cpf_cnpj"]: r for r in aproximada}
+    assert totais["12345678901"]["total_denuncias"] == 3
+    assert set(totais["12345678901"]["chave_pix_exemplo"].split("\n")) == set(chaves)
+    # O grupo mais antigo não some
+    assert totais["99999999999"]["total_denuncias"] == 1
+
+
+def test_facetas_aproximadas_contam_o_grupo_inteiro(cliente, cabecalhos, denunciar, monkeypatch):
+    import crud
+
+    nome = f"Maria {palavra_unica()}"
+    assert denunciar(nome_conta=nome, cpf_cnpj="99999999999", tipo_chave_pix="E-mail").status_code == 201
+    for _ in range(3):
+        assert denunciar(nome_conta=nome).status_code == 201
+
+    monkeypatch.setattr(crud, "LIMITE_CANDIDATOS_NOME", 2)
+    resposta = _pesquisar(cliente, cabecalhos, q=nome, modo="aproximado", facetas="true")
+    assert _faceta(resposta["facetas"], "tipo_chave_pix") == {"CPF": 3, "E-mail": 1}
+    assert _faceta(resposta["facetas"], "banco") == {"Banco Teste": 4}
+
+    resposta = _pesquisar(cliente, cabecalhos, q=nome, modo="aproximado", tipo="E-mail", facetas="true")
+    assert [r["total_denuncias"] for r in resposta["resultados"]] == [1]
+    assert _faceta(resposta["facetas"], "tipo_chave_pix") == {"CPF": 3, "E-mail": 1}
+
+
+def test_pesquisa_desde(cliente, cabecalhos, denunciar):
+    nome = f"Fulano {palavra_unica()}"
+    assert denunciar(nome_conta=nome).status_code == 201
+
+    ontem = (date.today() - timedelta(days=1)).isoformat()
+    amanha = (date.today() + timedelta(days=1)).isoformat()
+    assert len(_pesquisar(cliente, cabecalhos, q=nome, desde=ontem)) == 1
+    assert _pesquisar(cliente, cabecalhos, q=nome, desde=amanha) == []
+
+
+def test_pesquisa_com_facetas(cliente, cabecalhos, denunciar):
+    banco = f"Banco {palavra_unica()}"
+    nome = f"Fulano {palavra_unica()}"
+    for tipo in ("CPF", "CPF", "Telefone"):
+        assert denunciar(nome_conta=nome, banco=banco, tipo_chave_pix=tipo).status_code == 201
+
+    # Sem texto: vem dos contadores
+    resposta = _pesquisar(cliente, cabecalhos, facetas="true")
+    assert _faceta(resposta["facetas"], "banco")[banco] == 3
+
+    resposta = _pesquisar(cliente, cabecalhos, tipo="CPF", facetas="true")
+    assert _faceta(resposta["facetas"], "banco")[banco] == 2
+
+    resposta = _pesquisar(cliente, cabecalhos, banco=banco, facetas="true")
+    assert _faceta(resposta["facetas"], "tipo_chave_pix") == {"CPF": 2, "Telefone": 1}
+    assert sum(r["total_denuncias"] for r in resposta["resultados"]) == 3
+
+    # Com texto: recontagem sobre o resultado
+    resposta = _pesquisar(cliente, cabecalhos, q=nome, tipo="Telefone", facetas="true")
+    assert _faceta(resposta["facetas"], "banco") == {banco: 1}
+    assert _faceta(resposta["facetas"], "tipo_chave_pix") == {"CPF": 2, "Telefone": 1}
+
+    resposta = _pesquisar(cliente, cabecalhos, q=nome, modo="aproximado", facetas="true")
+    assert _faceta(resposta["facetas"], "banco") == {banco: 3}
+
+    # Sem 'facetas', a resposta continua sendo a lista
+    assert isinstance(_pesquisar(cliente, cabecalhos, q=nome), list)
+
+
+def test_facetas_nao_mudam_os_resultados(cliente, cabecalhos, denunciar):
+    banco = f"Banco {palavra_unica()}"
+    nome = f"Ciclano {palavra_unica()}"
+    chave = palavra_unica(11)
+    # O mesmo grupo (mesma chave Pix) com tipos de chave diferentes
+    for tipo in ("CPF", "Telefone", "Chave aleatória"):
+        assert denunciar(nome_conta=nome, banco=banco, tipo_chave_pix=tipo, chave_pix=chave).status_code == 201
+    assert denunciar(nome_conta=nome, tipo_chave_pix="CPF").status_code == 201
+
+    ontem = (date.today() - timedelta(days=1)).isoformat()
+    for parametros in (
+        {"q": nome},
+        {"q": nome, "tipo": "CPF"},
+        {"q": nome, "banco": banco},
+        {"q": nome, "tipo": "Telefone", "banco": banco},
+        {"q": nome, "modo": "aproximado"},
+        {"q": nome, "modo": "aproximado", "tipo": "CPF", "banco": banco},
+        {"desde": ontem, "banco": banco},
+    ):
+        sem_facetas = _pesquisar(cliente, cabecalhos, **parametros)
+        com_facetas = _pesquisar(cliente, cabecalhos, facetas="true", **parametros)["resultados"]
+        assert sorted(map(str, com_facetas)) == sorted(map(str, sem_facetas)), parametros
+
+    resposta = _pesquisar(cliente, cabecalhos, q=nome, tipo="CPF", banco=banco, facetas="true")
+    assert _faceta(resposta["facetas"], "tipo_chave_pix") == {"CPF": 1, "Telefone": 1, "Chave aleatória": 1}
+    assert _faceta(resposta["facetas"], "banco") == {banco: 1, "Banco Teste": 1}
+
+
+# ==================================
+#            SUGESTÕES
+# ==================================
+
+def test_sugestoes(cliente, cabecalhos, denunciar):
+    nome = f"Sugestao {palavra_unica()}"
+    assert denunciar(nome_conta=nome).status_code == 201
+
+    resposta = cliente.get(
+        "/api/sugestoes", params={"prefixo": nome[:-2], "campo": "nome_conta"}, headers=cabecalhos
+    )
+    assert resposta.status_code == 200
+    assert resposta.json() == [{"campo": "nome_conta", "valor": nome, "total_denuncias": 1}]
+
+    resposta = cliente.get("/api/sugestoes", params={"prefixo": ""}, headers=cabecalhos)
+    assert resposta.status_code == 422
@@ -0,0 +1,107 @@
+import gzip
+from datetime import date, datetime
+
+import orjson
+import pytest
+
+import arquivo
+
+
+@pytest.fixture
+def pasta_arquivo(tmp_path, monkeypatch):
+    monkeypatch.setattr(arquivo, "ARQUIVO_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _denuncia(id_denuncia: int) -> dict:
+    """Uma linha completa da tabela 'denuncias', como o arquivamento grava."""
+    return {
+        "id_denuncia": id_denuncia,
+        "grupo_fraude_id": f"chave-{id_denuncia}",
+        "tipo_chave_pix": "CPF",
+        "nome_conta": f"Conta {id_denuncia}",
+        "chave_pix": f"chave-{id_denuncia}",
+        "numero_bo": f"BO-{id_denuncia}",
+        "banco": "Banco",
+        "cpf_cnpj": "12345678901",
+        "anexo": b"%PDF" + bytes([id_denuncia % 256]) * 1000,
+        "agencia": None,
+        "conta": None,
+        "descricao": None,
+        "id_usuario": 1,
+        "anexo_hash": None,
+        "impressao_digital": None,
+        "data_denuncia": datetime(2020, 1, 15),
+    }
+
+
+def _arquivar(mes: date, ids):
+    gravador = arquivo.GravadorMes(mes)
+    for id_denuncia in ids:
+        gravador.escrever(_denuncia(id_denuncia))
+    gravador.concluir()
+
+
+def test_busca_le_so_o_registro_pedido(pasta_arquivo, monkeypatch):
+    _arquivar(date(2020, 1, 1), range(10, 200, 3))
+
+    descompactados = []
+    original = gzip.decompress
+    monkeypatch.setattr(gzip, "decompress", lambda dados: descompactados.append(dados) or original(dados))
+
+    encontrada = arquivo.buscar_denuncia(13)
+    assert encontrada.nome_conta == "Conta 13"
+    assert encontrada.anexo == _denuncia(13)["anexo"]
+    assert len(descompactados) == 1
+
+    # Dentro da faixa de ids, mas não arquivada: nada é descompactado
+    descompactados.clear()
+    assert arquivo.buscar_denuncia(14) is None
+    assert arquivo.buscar_denuncia(5000) is None
+    assert descompactados == []
+
+
+def test_cada_mes_no_seu_arquivo(pasta_arquivo):
+    _arquivar(date(2020, 1, 1), [1, 2, 3])
+    _arquivar(date(2020, 2, 1), [4, 7])
+
+    assert arquivo.buscar_denuncia(1).id_denuncia == 1
+    assert arquivo.buscar_denuncia(7).id_denuncia == 7
+    assert arquivo.ler_indice()["2020-02"]["total"] == 2
+
+
+def test_arquivo_continua_sendo_gzip_valido(pasta_arquivo):
+    _arquivar(date(2020, 1, 1), [1, 2, 3])
+
+    with gzip.open(pasta_arquivo / "denuncias_2020_01.jsonl.gz", "rb") as f:
+        assert [orjson.loads(linha)["id_denuncia"] for linha in f] == [1, 2, 3]
+
+
+def test_exige_ordem_de_id(pasta_arquivo):
+    gravador = arquivo.GravadorMes(date(2020, 1, 1))
+    gravador.escrever(_denuncia(5))
+    with pytest.raises(ValueError):
+        gravador.escrever(_denuncia(4))
+
+
+def test_faixas_de_ids_que_se_cruzam(pasta_arquivo):
+    # Denúncias com data retroativa: as faixas dos dois meses se sobrepõem
+    _arquivar(date(2020, 1, 1), [1, 5, 9])
+    _arquivar(date(2020, 2, 1), [3, 6, 7])
+
+    for id_denuncia in (1, 3, 5, 6, 7, 9):
+        assert arquivo.buscar_denuncia(id_denuncia).id_denuncia == id_denuncia
+    assert arquivo.buscar_denuncia(4) is None
+
+
+def test_anexo_arquivado_exige_login(cliente, cabecalhos, pasta_arquivo):
+    _arquivar(date(2020, 1, 1), [900_000_001])
+
+    assert cliente.get("/api/denuncias/900000001/anexo").status_code == 401
+
+    resposta = cliente.get("/api/denuncias/900000001/anexo", headers=cabecalhos)
+    assert resposta.status_code == 200
+    assert resposta.content == _denuncia(900_000_001)["anexo"]
+
+    resposta = cliente.get("/api/denuncias/900000001", headers=cabecalhos)
+    assert resposta.json()["nome_conta"] == "Conta 900000001"
@@ -0,0 +1,50 @@
+import pytest
+
+import busca_nomes
+
+# Grafias que precisam cair na mesma chave (o denunciante digita como lembra)
+MESMA_CHAVE = [
+    ("Gonçalves", "Goncalves"),
+    ("Conceição", "Conceicao"),
+    ("Assunção", "Assuncao"),
+    ("Souza", "Sousa"),
+    ("Luiz", "Luis"),
+    ("Thiago", "Tiago"),
+    ("Sylva", "Silva"),
+    ("Phelipe", "Felipe"),
+]
+
+# Nomes completos: a busca à direita precisa achar o nome gravado à esquerda
+MESMO_NOME = [
+    ("João Gonçalves", "Joao Goncalves"),
+    ("Maria da Conceição", "Maria Conceicao"),
+    ("Ana Assunção", "Ana Assuncao"),
+    ("João da Silva", "Joao Sylva"),
+    ("Luiz Thiago de Souza", "Luis Tiago Sousa"),
+]
+
+
+@pytest.mark.parametrize("palavra_a, palavra_b", MESMA_CHAVE)
+def test_chave_fonetica_igual(palavra_a, palavra_b):
+    assert busca_nomes.chave_fonetica(palavra_a) == busca_nomes.chave_fonetica(palavra_b)
+
+
+def test_chave_fonetica_diferencia_nomes():
+    assert busca_nomes.chave_fonetica("Silva") != busca_nomes.chave_fonetica("Santos")
+    assert busca_nomes.chave_fonetica("Carla") != busca_nomes.chave_fonetica("Sara")
+
+
+@pytest.mark.parametrize("gravado, busca", MESMO_NOME)
+def test_chaves_nome_acha_variacoes(gravado, busca):
+    chaves_busca = busca_nomes.chaves_nome(busca)
+    acertos = chaves_busca & busca_nomes.chaves_nome(gravado)
+    assert len(acertos) >= busca_nomes.minimo_chaves(len(chaves_busca))
+    assert busca_nomes.similaridade(
+        busca_nomes.normalizar_nome(gravado), busca_nomes.normalizar_nome(busca)
+    ) >= busca_nomes.SIMILARIDADE_MINIMA
+
+
+def test_chaves_nome_ignora_particulas_e_iniciais():
+    assert busca_nomes.chaves_nome("Maria dos Santos e Silva") == busca_nomes.chaves_nome("Maria Santos Silva")
+    assert busca_nomes.chaves_nome("José R. Lima") == busca_nomes.chaves_nome("José Lima")
+    assert busca_nomes.chaves_nome("da de") == set()
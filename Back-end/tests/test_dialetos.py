@@ -0,0 +1,37 @@
+"""
+O SQL que só o MySQL usa, conferido sem servidor (a suíte da API roda no
+MySQL com TEST_DATABASE_URL; veja o conftest).
+"""
+from sqlalchemy import column, literal_column, select
+from sqlalchemy.dialects import mysql, sqlite
+
+import dialetos
+import models
+
+
+def _sql(statement, dialeto) -> str:
+    return " ".join(str(statement.compile(dialect=dialeto)).split())
+
+
+def test_agregar_distintos_no_mysql():
+    statement = select(dialetos.agregar_distintos(column("chave_pix"), "\n"))
+    # O separador vai como literal (quebra de linha de verdade), não como parâmetro
+    assert str(statement.compile(dialect=mysql.dialect())) == (
+        "SELECT GROUP_CONCAT(DISTINCT chave_pix SEPARATOR '\n') AS agregar_distintos_1"
+    )
+
+
+def test_agregar_distintos_no_sqlite_nao_quebra_na_virgula():
+    statement = select(dialetos.agregar_distintos(literal_column("'a,b'"), "\n"))
+    sql = _sql(statement, sqlite.dialect())
+    assert "json_group_array(DISTINCT 'a,b')" in sql
+    assert "replace" not in sql
+
+
+def test_inserir_ou_somar_no_mysql():
+    tabela = models.ContagemDenuncias.__table__
+    statement = dialetos.inserir_ou_somar("mysql", tabela, {"tipo_chave_pix": "CPF", "banco": "B", "total": 1}, "total")
+    assert _sql(statement, mysql.dialect()) == (
+        "INSERT INTO contagens_denuncias (tipo_chave_pix, banco, total) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE total = (contagens_denuncias.total + VALUES(total))"
+    )
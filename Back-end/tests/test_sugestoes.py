@@ -0,0 +1,61 @@
+from conftest import palavra_unica
+
+import sugestoes
+
+
+def test_busca_por_prefixo_mais_denunciados_primeiro():
+    indice = sugestoes.IndicePrefixos()
+    indice.carregar([("João Silva", 3), ("Joana Souza", 5), ("Maria", 9), ("joao silva", 1)])
+
+    assert indice.buscar("jo", 8) == [("Joana Souza", 5), ("João Silva", 4)]
+    assert indice.buscar("JOÃO", 8) == [("João Silva", 4)]
+    assert indice.buscar("x", 8) == []
+
+
+def test_adicionar_atualiza_o_cache():
+    indice = sugestoes.IndicePrefixos()
+    indice.carregar([("Ana", 2), ("Antonio", 1)])
+    assert indice.buscar("an", 1) == [("Ana", 2)]
+
+    indice.adicionar("Antonio", 5)
+    indice.adicionar("Anselmo")
+    assert indice.buscar("an", 8) == [("Antonio", 6), ("Ana", 2), ("Anselmo", 1)]
+
+
+def test_recarregar_troca_o_indice_inteiro():
+    indice = sugestoes.IndiceSugestoes()
+    indice.carregar("banco", [("Nubank", 1)])
+    antigo = indice.campos["banco"]
+
+    indice.carregar("banco", [("Nubank", 4), ("Inter", 2)])
+    assert indice.campos["banco"] is not antigo
+    assert indice.buscar("n", "banco", 8) == [{"campo": "banco", "valor": "Nubank", "total_denuncias": 4}]
+
+
+def test_recarga_traz_denuncias_de_outros_workers(cliente, cabecalhos):
+    import crud
+    import main
+    from database import AsyncSessionLocal
+
+    nome = f"Outro Worker {palavra_unica()}"
+
+    async def denunciar_por_outro_worker():
+        # Grava direto no banco, sem passar pelo índice deste processo
+        async with AsyncSessionLocal() as db:
+            await crud.create_denuncia(
+                db=db, id_usuario=None, anexo_bytes=b"%PDF", anexo_hash=palavra_unica(64),
+                impressao_digital=palavra_unica(64), tipo_chave_pix="CPF", chave_pix=palavra_unica(11),
+                nome_conta=nome, numero_bo=palavra_unica(), cpf_cnpj="1", banco="Banco Teste",
+                agencia=None, conta=None, descricao=None
+            )
+
+    def sugerir():
+        return cliente.get(
+            "/api/sugestoes", params={"prefixo": nome, "campo": "nome_conta"}, headers=cabecalhos
+        ).json()
+
+    cliente.portal.call(denunciar_por_outro_worker)
+    assert sugerir() == []
+
+    cliente.portal.call(main.carregar_sugestoes)
+    assert sugerir() == [{"campo": "nome_conta", "valor": nome, "total_denuncias": 1}]
@@ -23,11 +23,47 @@ CREATE TABLE IF NOT EXISTS denuncias (
     
     -- Campos Gerenciados pelo Sistema
     grupo_fraude_id VARCHAR(255) NULL,
-    data_denuncia DATETIME DEFAULT CURRENT_TIMESTAMP, -- CORREÇÃO (era VARCHAR(10))
+    id_usuario INT NULL,
+    anexo_hash CHAR(64) NULL,
+    impressao_digital CHAR(64) NULL,
+    data_denuncia DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, -- CORREÇÃO (era VARCHAR(10))
 
     -- Índices para performance
     INDEX idx_chave_pix (chave_pix),
-    INDEX idx_grupo_fraude (grupo_fraude_id)
+    INDEX idx_grupo_fraude (grupo_fraude_id),
+    INDEX ix_denuncias_id_usuario (id_usuario),
+    INDEX ix_denuncias_impressao_digital (impressao_digital),
+    INDEX idx_tipo_banco (tipo_chave_pix, banco)
+);
+
+-- Impressões digitais já usadas (barra denúncias repetidas).
+-- Fica fora de 'denuncias' porque tabela particionada não aceita
+-- índice único sem a coluna da partição (veja tarefas.py particionar).
+CREATE TABLE IF NOT EXISTS impressoes_denuncias (
+    impressao_digital VARCHAR(64) PRIMARY KEY,
+    id_denuncia INT NOT NULL
+);
+
+-- Chaves fonéticas do nome da conta (busca aproximada, modo=aproximado)
+-- Para denúncias antigas: python tarefas.py backfill-nomes
+CREATE TABLE IF NOT EXISTS denuncias_chaves_nome (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    id_denuncia INT NOT NULL,
+    grupo_fraude_id VARCHAR(255) NOT NULL,
+    chave VARCHAR(40) NOT NULL,
+
+    INDEX ix_denuncias_chaves_nome_id_denuncia (id_denuncia),
+    INDEX idx_chave_grupo (chave, grupo_fraude_id, id_denuncia)
+);
+
+-- Contadores das facetas da pesquisa (denúncias por tipo de chave e banco).
+-- Somados a cada denúncia nova; refeitos com: python tarefas.py recontar-facetas
+CREATE TABLE IF NOT EXISTS contagens_denuncias (
+    tipo_chave_pix VARCHAR(15) NOT NULL,
+    banco VARCHAR(100) NOT NULL,
+    total INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (tipo_chave_pix, banco)
 );
 
 SET FOREIGN_KEY_CHECKS=1;
\ No newline at end of file